@@ -4,40 +4,94 @@ CLI for scoring tool.
 
 from __future__ import annotations
 import sys
-import io
 import argparse
-from typing import List
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Tuple
 from pathlib import Path
 import time
 import os
 from contextlib import redirect_stdout
 import math
-import json
+import multiprocessing
+from collections import deque
+import orjson
+import logging
 from utils.logging import setup_logging, set_run_id, get_logger
+from utils.cache import memoized
 from url_handler.base import classify_url
-
-# from url_handler.model import handle_model_url
-# from url_handler.dataset import handle_dataset_url
-# from url_handler.code import handle_code_url
-from metrics.size import get_size_score
-from metrics.license import get_license_score
-from metrics.dataset_quality import get_dataset_quality_score
-from metrics.code_quality import get_code_quality
-from metrics.performance_claims import get_performance_claims
-from metrics.dataset_and_code import get_dataset_and_code_score
-from metrics.rampup import get_ramp_up
-from metrics.busfactor import get_bus_factor
 from metrics.base import get_repo_id
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-MAX_WORKERS = int(os.environ.get("SCORER_MAX_WORKERS", "4"))
-_BOOT_STDOUT = sys.stdout
-sys.stdout = io.StringIO()
 
-
-def parse_args() -> argparse.Namespace:
+# The metric modules pull in huggingface_hub, GitPython, requests, etc.; they are
+# imported lazily in _metric_tasks so --help and bad-input runs start fast.
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+
+# I/O-bound work: default to min(32, 5 * cpus) workers, overridable via env
+MAX_WORKERS = int(
+    os.environ.get("SCORER_MAX_WORKERS", str(min(32, (os.cpu_count() or 1) * 5)))
+)
+# one classified URL on an input line:
+# (url, url_type, {metric_name: future}, perf_counter_ns when its metrics were
+# submitted, possibly for an earlier line sharing the URL)
+LineEntry = Tuple[str, str, Dict[str, Future], int]
+# metrics dominated by in-process analysis (ast parsing over a cloned repo) run
+# in a process pool so they are not serialized by the GIL
+_CPU_BOUND = frozenset({"code_quality"})
+# process-pool workers start lazily, once the I/O threads are already running;
+# forking a threaded process can leave the child holding a lock (HTTP pool,
+# SQLite cache, logging) that no thread will release, so never use plain fork
+_MP_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# NDJSON category for each classified url_type
+_CATEGORY = {"model": "MODEL", "dataset": "DATASET", "code": "CODE"}
+# NDJSON fields, in output order
+_OUTPUT_FIELDS = (
+    "name",
+    "category",
+    "net_score",
+    "net_score_latency",
+    "ramp_up_time",
+    "ramp_up_time_latency",
+    "bus_factor",
+    "bus_factor_latency",
+    "performance_claims",
+    "performance_claims_latency",
+    "license",
+    "license_latency",
+    "size_score",
+    "size_score_latency",
+    "dataset_and_code_score",
+    "dataset_and_code_score_latency",
+    "dataset_quality",
+    "dataset_quality_latency",
+    "code_quality",
+    "code_quality_latency",
+)
+# score fields are floats; everything else in a zero row is an int latency
+_ZERO_SCORES = dict.fromkeys(
+    (f for f in _OUTPUT_FIELDS[2:] if not f.endswith("_latency") and f != "size_score"),
+    0.0,
+)
+# zero size_score, copied per row rather than rebuilt from a literal
+_SIZE_TEMPLATE = dict.fromkeys(
+    ("raspberry_pi", "jetson_nano", "desktop_pc", "aws_server"), 0.0
+)
+# (value, latency) for a metric that did not run on a line
+_NO_RESULT = (0.0, 0)
+# lines read ahead of the one being collected, bounding in-flight futures
+MAX_PENDING_LINES = 1024
+# NDJSON bytes buffered before each write to stdout
+OUTPUT_CHUNK_BYTES = 1 << 16
+
+
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse CLI arguments
+    Build the CLI argument parser
     """
     parser = argparse.ArgumentParser(
         description="CLI for scoring models, datasets, and code."
@@ -70,26 +124,207 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional run id to correlate logs across processes",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help="Max concurrent metric calls (default $SCORER_MAX_WORKERS or "
+        "min(32, 5 * cpus); 1 runs serially)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every metric instead of reusing cached results "
+        "(cache dir: $SCORER_CACHE_DIR or ~/.cache/scorer, TTL: $SCORER_CACHE_TTL)",
+    )
+    return parser
 
 
-def read_urls(file_path: Path) -> List[List[str]]:
+_PARSER = _build_parser()
+
+
+def parse_args() -> argparse.Namespace:
     """
-    read newline-delimited URLs from a file
+    Parse CLI arguments
+    """
+    return _PARSER.parse_args()
+
+
+def iter_urls(file_path: Path) -> Iterator[List[str]]:
     """
-    # check if file path exists
-    if not file_path.exists():
-        raise FileNotFoundError(f"URL file {file_path} does not exist.")
-    urls: List[List[str]] = []
-    with file_path.open("r", encoding="utf-8") as f:
+    Lazily yield the comma-separated URLs on each line of a newline-delimited file.
+    The file is opened eagerly, so a missing path raises FileNotFoundError here
+    rather than on first iteration.
+    """
+    f = file_path.open("rb", buffering=1 << 20)
+    return _parse_url_lines(f)
+
+
+def _parse_url_lines(f: BinaryIO) -> Iterator[List[str]]:
+    # split and strip on bytes; only the surviving URL tokens are decoded
+    with f:
         for raw in f:
             line = raw.strip()
-            if not line or line.startswith("#"):
+            if not line or line.startswith(b"#"):
                 continue  # skip blank/comment
-            parts = [u.strip() for u in line.split(",") if u.strip()]
+            parts = [
+                tok.decode("utf-8", "replace")
+                for tok in (p.strip() for p in line.split(b","))
+                if tok
+            ]
             if parts:  # <-- only keep non-empty lines
-                urls.append(parts)
-    return urls
+                yield parts
+
+
+def classify_line(line: List[str], log: logging.LoggerAdapter) -> List[Tuple[str, str]]:
+    """
+    Classify the URLs on one input line by type (model, dataset, code), dropping
+    unknown ones. classify_url only parses the URL string (no network I/O).
+    """
+    line_classifications: List[Tuple[str, str]] = []
+    # checked once per line so silent runs skip building per-URL log records
+    verbose = log.isEnabledFor(logging.INFO)
+    for url in line:
+        if verbose:
+            log.info("processing url", extra={"phase": "controller", "url": url})
+        try:
+            url_type = classify_url(url)
+        except Exception:
+            log.exception(
+                "classification failed", extra={"phase": "controller", "url": url}
+            )
+            print(f"{url} -> ERROR: classification failed", file=sys.stderr)
+            continue
+        if verbose:
+            log.info("classified", extra={"phase": "controller", "type": url_type})
+
+        if url_type == "unknown":
+            # skip just this URL; the rest of the line (and run) continues
+            log.warning("unknown url type", extra={"phase": "controller", "url": url})
+            continue
+        line_classifications.append((url, url_type))
+    return line_classifications
+
+
+def _code_tasks(url: str, url_type: str) -> Dict[str, Callable[[], Tuple]]:
+    from metrics.code_quality import get_code_quality
+
+    # partial (not a lambda) so it pickles into the process pool
+    return {"code_quality": partial(get_code_quality, url, url_type)}
+
+
+def _dataset_tasks(url: str, url_type: str) -> Dict[str, Callable[[], Tuple]]:
+    from metrics.dataset_quality import get_dataset_quality_score
+    from metrics.dataset_and_code import get_dataset_and_code_score
+
+    return {
+        "dataset_quality": partial(get_dataset_quality_score, url, url_type),
+        "dataset_and_code_score": partial(get_dataset_and_code_score, url, url_type),
+    }
+
+
+def _model_tasks(url: str, url_type: str) -> Dict[str, Callable[[], Tuple]]:
+    from metrics.size import get_size_score
+    from metrics.license import get_license_score
+    from metrics.performance_claims import get_performance_claims
+    from metrics.busfactor import get_bus_factor
+    from metrics.rampup import get_ramp_up
+
+    return {
+        "size": partial(get_size_score, url, url_type),
+        "license": partial(get_license_score, url, url_type),
+        "performance_claims": partial(get_performance_claims, url, url_type),
+        "bus_factor": partial(get_bus_factor, url, url_type),
+        "ramp_up": partial(get_ramp_up, url, url_type),
+    }
+
+
+# url_type -> builder of the metric calls that apply to it; a new URL type only
+# needs an entry here
+_TASKS_BY_TYPE: Dict[str, Callable[[str, str], Dict[str, Callable[[], Tuple]]]] = {
+    "code": _code_tasks,
+    "dataset": _dataset_tasks,
+    "model": _model_tasks,
+}
+
+
+def _metric_tasks(url: str, url_type: str) -> Dict[str, Callable[[], Tuple]]:
+    """
+    Build the metric calls that apply to a URL of the given type
+    """
+    build = _TASKS_BY_TYPE.get(url_type)
+    return build(url, url_type) if build else {}
+
+
+def _timed_metric(
+    metric_name: str, url: str, url_type: str, fn: Callable[[], Tuple]
+) -> Tuple[Any, int, int]:
+    """
+    Run one (memoized) metric in a worker and return
+    (value, latency_ms, finished_ns), timed here with the monotonic
+    perf_counter_ns so cached and fresh results report latency the same way.
+    """
+    t0 = time.perf_counter_ns()
+    value = memoized(metric_name, (url, url_type), fn)[0]
+    t1 = time.perf_counter_ns()
+    return value, (t1 - t0) // 1_000_000, t1
+
+
+def _quiet_worker() -> None:
+    """
+    Process-pool initializer: metric modules print to stdout, which must stay
+    reserved for NDJSON (redirect_stdout in main does not reach child processes)
+    """
+    sys.stdout = open(os.devnull, "w")
+
+
+def submit_metrics(
+    io_pool: Executor, cpu_pool: Executor, url: str, url_type: str
+) -> Dict[str, Future]:
+    """
+    Submit every metric for a URL, keyed by metric name. CPU-bound metrics go to
+    the process pool, network-bound ones to the thread pool.
+    Results are memoized on disk per (metric, url, url_type); see utils/cache.py.
+    """
+    return {
+        metric_name: (cpu_pool if metric_name in _CPU_BOUND else io_pool).submit(
+            _timed_metric, metric_name, url, url_type, fn
+        )
+        for metric_name, fn in _metric_tasks(url, url_type).items()
+    }
+
+
+def score_url(url: str, futures: Dict[str, Future]) -> Dict[str, Tuple]:
+    """
+    Wait for a URL's metric futures and return
+    {metric_name: (value, latency_ms, finished_ns)}.
+    A failed metric is logged and scored as (0.0, 0, 0).
+    """
+    log = get_logger("cli")
+    results: Dict[str, Tuple] = {}
+    for metric_name, fut in futures.items():
+        try:
+            results[metric_name] = fut.result()
+        except Exception:
+            log.exception(
+                "metric failed",
+                extra={"phase": "metrics", "metric": metric_name, "url": url},
+            )
+            results[metric_name] = (0.0, 0, 0)
+    return results
+
+
+def _emit(buf: bytearray, row: Dict[str, Any], out: BinaryIO) -> None:
+    """
+    Append one NDJSON row to buf, writing it out in a single call once it holds
+    OUTPUT_CHUNK_BYTES so long runs stream results with bounded memory
+    """
+    buf += orjson.dumps(row)
+    buf += b"\n"
+    if len(buf) >= OUTPUT_CHUNK_BYTES:
+        out.write(buf)
+        out.flush()
+        buf.clear()
 
 
 def main() -> None:
@@ -114,20 +349,19 @@ def main() -> None:
         # ensure a default is present so the file is always produced
         os.environ.setdefault("LOG_FILE", "logs/scorer.log")
 
+    if args.no_cache:
+        os.environ["SCORER_NO_CACHE"] = "1"
+
     # Init logging
     os.environ["LOG_LEVEL"] = str(args.log_level)
     setup_logging(level=args.log_level, json_lines=not args.log_text)
     run_id = set_run_id(args.run_id)
     log = get_logger("cli")
-    import logging
 
     for h in logging.getLogger().handlers:
         if isinstance(h, logging.StreamHandler):
             h.stream = sys.stderr
 
-    # --- restore real stdout now that imports are done ---
-    sys.stdout = _BOOT_STDOUT
-
     start_ns = time.perf_counter_ns()
     log.info(
         "run started", extra={"phase": "run", "function": "main", "run_id": run_id}
@@ -135,283 +369,73 @@ def main() -> None:
 
     # open URL file
     try:
-        urls = read_urls(url_file_path)
-        log.info(
-            "read urls",
-            extra={"phase": "run", "count": len(urls), "file": str(url_file_path)},
-        )
+        url_lines = iter_urls(url_file_path)
+        log.info("opened url file", extra={"phase": "run", "file": str(url_file_path)})
     except Exception as e:
         print(f"Error reading URL file {e}", file=sys.stderr)
         log.exception("failed to read url file", extra={"phase": "run"})
         sys.exit(1)
 
-    # Classify URLs by type (model, dataset, code)
-    classifications = []
-    for line in urls:
-        line_classifications = {}
-        for url in line:
-            log.info("processing url", extra={"phase": "controller", "url": url})
-            try:
-                with redirect_stdout(io.StringIO()):
-                    url_type = classify_url(url)
-                log.info("classified", extra={"phase": "controller", "type": url_type})
-            except Exception:
-                log.exception(
-                    "classification failed", extra={"phase": "controller", "url": url}
-                )
-                print(f"{url} -> ERROR: classification failed", file=sys.stderr)
-                continue
-
-            if url_type == "unknown":
-                log.warning("unknown url type", extra={"phase": "controller"})
-                continue
-            if url_type == "model":
-                # try:
-                #     with redirect_stdout(io.StringIO()):
-                #         handle_model_url(url)
-                # except Exception:
-                #     log.exception("handle_model_url failed", extra={"url": url})
-                line_classifications[url] = url_type
-            elif url_type == "dataset":
-                # try:
-                #     with redirect_stdout(io.StringIO()):
-                #         handle_dataset_url(url)
-                # except Exception:
-                #     log.exception("handle_dataset_url failed", extra={"url": url})
-                line_classifications[url] = url_type
-            elif url_type == "code":
-                # try:
-                #     with redirect_stdout(io.StringIO()):
-                #         handle_code_url(url)
-                # except Exception:
-                #     log.exception("handle_code_url failed", extra={"url": url})
-                line_classifications[url] = url_type
-        classifications.append(line_classifications)
-
-    # Calculate metrics
-    for line in classifications:
-        start_time = time.perf_counter_ns()
-        try:
-            # intialize all fields to zero
-            # string fields
-            name = ""
-            category = ""
-
-            # float scores (0–1)
-            net_score = 0.0
-            ramp_up = 0.0
-            bus_factor = 0.0
-            performance_claims = 0.0
-            license = 0.0
-            dataset_and_code_score = 0.0
-            dataset_quality = 0.0
-            code_quality = 0.0
-
-            # latencies (milliseconds)
-            net_score_latency = 0
-            ramp_up_latency = 0
-            bus_factor_latency = 0
-            performance_claims_latency = 0
-            license_latency = 0
-            size_latency = 0
-            dataset_and_code_score_latency = 0
-            dataset_quality_latency = 0
-            code_quality_latency = 0
-
-            # object field (dict)
-            size_dict = {
-                "raspberry_pi": 0.0,
-                "jetson_nano": 0.0,
-                "desktop_pc": 0.0,
-                "aws_server": 0.0,
-            }
-
-            # update fields based on URL type
-            for url, url_type in line.items():
-                try:
-                    with redirect_stdout(io.StringIO()):
-                        repo = get_repo_id(url, url_type) or ""
-                except Exception:
-                    log.exception("get_repo_id failed", extra={"url": url})
-                    repo = ""
-                parts = repo.split("/", 1)
-                name = parts[1] if len(parts) == 2 else (parts[0] if parts else "")
-                category = url_type.upper()
-
-                tasks = {}
-                if url_type == "code":
-                    tasks["code_quality"] = lambda: get_code_quality(url, url_type)
-                elif url_type == "dataset":
-                    tasks["dataset_quality"] = lambda: get_dataset_quality_score(
-                        url, url_type
-                    )
-                    tasks["dataset_and_code_score"] = (
-                        lambda: get_dataset_and_code_score(url, url_type)
-                    )
-                elif url_type == "model":
-                    tasks["size"] = lambda: get_size_score(url, url_type)
-                    tasks["license"] = lambda: get_license_score(url, url_type)
-                    tasks["performance_claims"] = lambda: get_performance_claims(
-                        url, url_type
-                    )
-                    tasks["bus_factor"] = lambda: get_bus_factor(url, url_type)
-                    tasks["ramp_up"] = lambda: get_ramp_up(url, url_type)
-                with redirect_stdout(io.StringIO()):
-                    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-                        futures = {
-                            ex.submit(fn): met_name for met_name, fn in tasks.items()
-                        }
-                        for fut in as_completed(futures):
-                            metric_name = futures[fut]
-                            try:
-                                val, lat = fut.result()
-                            except Exception:
-                                log.exception(
-                                    "metric failed",
-                                    extra={
-                                        "phase": "metrics",
-                                        "metric": metric_name,
-                                        "url": url,
-                                    },
-                                )
-                                val, lat = (0.0, 0)
-                            if metric_name == "code_quality":
-                                code_quality, code_quality_latency = val, lat
-                            elif metric_name == "dataset_quality":
-                                dataset_quality, dataset_quality_latency = val, lat
-                            elif metric_name == "dataset_and_code_score":
-                                dataset_and_code_score = val
-                                dataset_and_code_score_latency = lat
-                            elif metric_name == "size":
-                                size_dict, size_latency = val, lat
-                            elif metric_name == "license":
-                                license, license_latency = val, lat
-                            elif metric_name == "performance_claims":
-                                performance_claims = val
-                                performance_claims_latency = lat
-                            elif metric_name == "bus_factor":
-                                bus_factor, bus_factor_latency = val, lat
-                            elif metric_name == "ramp_up":
-                                ramp_up, ramp_up_latency = val, lat
-
-            if not line:  # nothing recognized on this line
-                # Still print a default row for this input line
-                output = {
-                    "name": "",
-                    "category": "UNKNOWN",
-                    "net_score": 0.0,
-                    "net_score_latency": 0,
-                    "ramp_up_time": 0.0,
-                    "ramp_up_time_latency": 0,
-                    "bus_factor": 0.0,
-                    "bus_factor_latency": 0,
-                    "performance_claims": 0.0,
-                    "performance_claims_latency": 0,
-                    "license": 0.0,
-                    "license_latency": 0,
-                    "size_score": {
-                        "raspberry_pi": 0.0,
-                        "jetson_nano": 0.0,
-                        "desktop_pc": 0.0,
-                        "aws_server": 0.0,
-                    },
-                    "size_score_latency": 0,
-                    "dataset_and_code_score": 0.0,
-                    "dataset_and_code_score_latency": 0,
-                    "dataset_quality": 0.0,
-                    "dataset_quality_latency": 0,
-                    "code_quality": 0.0,
-                    "code_quality_latency": 0,
-                }
-                print(json.dumps(output, separators=(",", ":")))
-                sys.stdout.flush()
-                continue
-
-            # Compute net score
-            size_score = 0.0
-            if size_dict:
-                size_score = sum(size_dict.values()) / len(size_dict)
-
-            net_score = (
-                0.15 * size_score
-                + 0.15 * license
-                + 0.10 * ramp_up
-                + 0.10 * bus_factor
-                + 0.15 * dataset_quality
-                + 0.10 * code_quality
-                + 0.15 * performance_claims
-                + 0.10 * dataset_and_code_score
-            )
-
-            # Compute net score latency in milliseconds
-            net_score_latency = max(
-                1, math.ceil((time.perf_counter_ns() - start_time) / 1_000_000)
-            )
-
-            # Build NDJSON output
-            output = {
-                "name": name,
-                "category": category,
-                "net_score": round(net_score, 2),
-                "net_score_latency": net_score_latency,
-                "ramp_up_time": round(ramp_up, 2),
-                "ramp_up_time_latency": ramp_up_latency,
-                "bus_factor": round(bus_factor, 2),
-                "bus_factor_latency": bus_factor_latency,
-                "performance_claims": round(performance_claims, 2),
-                "performance_claims_latency": performance_claims_latency,
-                "license": round(license, 2),
-                "license_latency": license_latency,
-                "size_score": (
-                    {k: round(v, 2) for k, v in size_dict.items()} if size_dict else {}
-                ),
-                "size_score_latency": size_latency,
-                "dataset_and_code_score": round(dataset_and_code_score, 2),
-                "dataset_and_code_score_latency": dataset_and_code_score_latency,
-                "dataset_quality": round(dataset_quality, 2),
-                "dataset_quality_latency": dataset_quality_latency,
-                "code_quality": round(code_quality, 2),
-                "code_quality_latency": code_quality_latency,
-            }
-
-            print(json.dumps(output, separators=(",", ":")))
-            # sys.stdout.flush()
-        except Exception:
-            log.exception("unexpected error while scoring line", extra={"phase": "run"})
-            print(
-                json.dumps(
-                    {
-                        "name": "",
-                        "category": "",
-                        "net_score": 0.0,
-                        "net_score_latency": 0,
-                        "ramp_up_time": 0.0,
-                        "ramp_up_time_latency": 0,
-                        "bus_factor": 0.0,
-                        "bus_factor_latency": 0,
-                        "performance_claims": 0.0,
-                        "performance_claims_latency": 0,
-                        "license": 0.0,
-                        "license_latency": 0,
-                        "size_score": {
-                            "raspberry_pi": 0.0,
-                            "jetson_nano": 0.0,
-                            "desktop_pc": 0.0,
-                            "aws_server": 0.0,
-                        },
-                        "size_score_latency": 0,
-                        "dataset_and_code_score": 0.0,
-                        "dataset_and_code_score_latency": 0,
-                        "dataset_quality": 0.0,
-                        "dataset_quality_latency": 0,
-                        "code_quality": 0.0,
-                        "code_quality_latency": 0,
-                    },
-                    separators=(",", ":"),
-                )
-            )
-            sys.stdout.flush()
-            continue
+    # Stream the file through one shared pool: each line is classified and its
+    # metrics submitted as soon as it is read, so network-bound work overlaps with
+    # reading and across lines, while at most MAX_PENDING_LINES lines wait to be
+    # collected. Rows are emitted in input order, serialized with orjson into a
+    # buffer that is written out every OUTPUT_CHUNK_BYTES. Metric chatter on
+    # stdout goes to the null device for the whole run instead of accumulating in
+    # a StringIO, so keep a handle on the real stdout for the rows.
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    buf = bytearray()
+    count = 0
+    try:
+        with open(os.devnull, "w") as null, redirect_stdout(null), ThreadPoolExecutor(
+            max_workers=args.workers
+        ) as ex, ProcessPoolExecutor(
+            max_workers=min(args.workers, os.cpu_count() or 1),
+            initializer=_quiet_worker,
+            mp_context=multiprocessing.get_context(_MP_START_METHOD),
+        ) as cpu_ex:
+            # a URL shared by several pending lines (e.g. one dataset used by many
+            # models) is scored once; every line holding it waits on the same
+            # futures, which are dropped once the last of those lines is emitted
+            # (a later line naming the URL again hits the on-disk cache instead)
+            submitted: Dict[Tuple[str, str], Tuple[Dict[str, Future], int]] = {}
+            holders: Dict[Tuple[str, str], int] = {}
+            pending: Deque[Tuple[List[LineEntry], int]] = deque()
+
+            def emit_next() -> None:
+                line_futures, line_start = pending.popleft()
+                _emit(buf, _score_line(line_futures, line_start, log), out)
+                for url, url_type, _, _ in line_futures:
+                    key = (url, url_type)
+                    holders[key] -= 1
+                    if not holders[key]:
+                        del holders[key], submitted[key]
+
+            for line in url_lines:
+                count += 1
+                line_start = time.perf_counter_ns()
+                line_futures: List[LineEntry] = []
+                for url, url_type in classify_line(line, log):
+                    key = (url, url_type)
+                    if key not in submitted:
+                        submitted[key] = (
+                            submit_metrics(ex, cpu_ex, url, url_type),
+                            time.perf_counter_ns(),
+                        )
+                    holders[key] = holders.get(key, 0) + 1
+                    line_futures.append((url, url_type, *submitted[key]))
+                pending.append((line_futures, line_start))
+                if len(pending) >= MAX_PENDING_LINES:
+                    emit_next()
+            while pending:
+                emit_next()
+    finally:
+        # also on an abort (e.g. a BaseException out of a worker): rows already
+        # scored are written rather than lost with the buffer
+        out.write(buf)
+        out.flush()
+    log.info("read urls", extra={"phase": "run", "count": count})
 
     dur_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
     log.info(
@@ -420,5 +444,122 @@ def main() -> None:
     exit(0)
 
 
+def _empty_row(category: str) -> Dict[str, Any]:
+    """
+    Zero-score row for a line with no recognized URLs or one that failed to score
+    """
+    row = dict.fromkeys(_OUTPUT_FIELDS, 0)
+    row.update(_ZERO_SCORES)
+    row.update(name="", category=category, size_score=_SIZE_TEMPLATE.copy())
+    return row
+
+
+def _score_line(
+    line: List[LineEntry],
+    start_time: int,
+    log: logging.LoggerAdapter,
+) -> Dict[str, Any]:
+    """
+    Collect the metric results for one input line and build its NDJSON row
+    """
+    if not line:  # nothing recognized on this line
+        # Still print a default row for this input line
+        return _empty_row("UNKNOWN")
+    try:
+        name = ""
+        category = ""
+
+        # latest (value, latency) per metric across the URLs on this line
+        results: Dict[str, Tuple[Any, int]] = {}
+        finished_ns = start_time
+        for url, url_type, futures, submitted_ns in line:
+            # results shared with an earlier line were started on its behalf;
+            # measure from then so net latency covers the metric latencies
+            start_time = min(start_time, submitted_ns)
+            try:
+                repo = get_repo_id(url, url_type) or ""
+            except Exception:
+                log.exception("get_repo_id failed", extra={"url": url})
+                repo = ""
+            owner, sep, repo_name = repo.partition("/")
+            name = repo_name if sep else owner
+            category = _CATEGORY[url_type]
+
+            for metric_name, (val, lat, done_ns) in score_url(url, futures).items():
+                finished_ns = max(finished_ns, done_ns)
+                # None: the metric could not be computed (and was not cached)
+                results[metric_name] = (0.0 if val is None else val, lat)
+
+        ramp_up, ramp_up_latency = results.get("ramp_up", _NO_RESULT)
+        bus_factor, bus_factor_latency = results.get("bus_factor", _NO_RESULT)
+        performance_claims, performance_claims_latency = results.get(
+            "performance_claims", _NO_RESULT
+        )
+        license, license_latency = results.get("license", _NO_RESULT)
+        size_dict, size_latency = results.get("size", (None, 0))
+        size_dict = size_dict or _SIZE_TEMPLATE.copy()
+        dataset_and_code_score, dataset_and_code_score_latency = results.get(
+            "dataset_and_code_score", _NO_RESULT
+        )
+        dataset_quality, dataset_quality_latency = results.get(
+            "dataset_quality", _NO_RESULT
+        )
+        code_quality, code_quality_latency = results.get("code_quality", _NO_RESULT)
+
+        # Compute net score
+        size_score = sum(size_dict.values()) / len(size_dict) if size_dict else 0.0
+
+        net_score = (
+            0.15 * size_score
+            + 0.15 * license
+            + 0.10 * ramp_up
+            + 0.10 * bus_factor
+            + 0.15 * dataset_quality
+            + 0.10 * code_quality
+            + 0.15 * performance_claims
+            + 0.10 * dataset_and_code_score
+        )
+
+        # Compute net score latency in milliseconds
+        # (metrics run concurrently, so this is the wall time from the earliest
+        # submission of this line's metrics until its slowest metric finished)
+        net_score_latency = max(1, math.ceil((finished_ns - start_time) / 1_000_000))
+
+        # Build NDJSON output
+        output = dict(
+            zip(
+                _OUTPUT_FIELDS,
+                (
+                    name,
+                    category,
+                    round(net_score, 2),
+                    net_score_latency,
+                    round(ramp_up, 2),
+                    ramp_up_latency,
+                    round(bus_factor, 2),
+                    bus_factor_latency,
+                    round(performance_claims, 2),
+                    performance_claims_latency,
+                    round(license, 2),
+                    license_latency,
+                    # already rounded per device by size._score_on_hardware
+                    size_dict,
+                    size_latency,
+                    round(dataset_and_code_score, 2),
+                    dataset_and_code_score_latency,
+                    round(dataset_quality, 2),
+                    dataset_quality_latency,
+                    round(code_quality, 2),
+                    code_quality_latency,
+                ),
+            )
+        )
+
+        return output
+    except Exception:
+        log.exception("unexpected error while scoring line", extra={"phase": "run"})
+        return _empty_row("")
+
+
 if __name__ == "__main__":
     main()
@@ -2,7 +2,10 @@
 Helper function for splicing url
 """
 
+from functools import lru_cache
 
+
+@lru_cache(maxsize=4096)
 def get_repo_id(url: str, url_type: str) -> str:
     parts = url.split("/")
 
@@ -14,88 +14,91 @@ import re
 import math
 import time
 import shutil
-import tempfile
 import datetime as dt
-from pathlib import Path
-from typing import Dict, Set, Tuple, List
+from typing import Dict, Optional, Set, Tuple, List
+from functools import lru_cache
 from collections import defaultdict
 from urllib.parse import urlparse
 from git import Repo, GitCommandError
+from .scratch import make_clone_dir
 
 # Optional: if huggingface_hub is installed, we can resolve code repo links
 try:
-    from huggingface_hub import HfApi
-
-    HF = HfApi()
+    from .session import hf_info
 except Exception:
-    HF = None  # still works; we’ll just clone the HF git repo if needed
+    hf_info = None  # still works; we’ll just clone the HF git repo if needed
 
 SINCE_DAYS_DEFAULT = 600
 
-CODE_EXTS = {
-    ".py",
-    ".ipynb",
-    ".md",
-    ".rst",
-    ".txt",
-    ".json",
-    ".yaml",
-    ".yml",
-    ".ini",
-    ".toml",
-    ".cfg",
-    ".sh",
-    ".bat",
-    ".ps1",
-    ".js",
-    ".ts",
-    ".jsx",
-    ".tsx",
-    ".java",
-    ".scala",
-    ".kt",
-    ".c",
-    ".h",
-    ".hpp",
-    ".hh",
-    ".cc",
-    ".cpp",
-    ".m",
-    ".mm",
-    ".go",
-    ".rs",
-    ".rb",
-    ".php",
-    ".pl",
-    ".r",
-    ".swift",
-    ".css",
-    ".scss",
-    ".html",
-    ".xml",
-}
-BINARY_SKIP_EXTS = {
-    ".bin",
-    ".safetensors",
-    ".pt",
-    ".pth",
-    ".onnx",
-    ".tflite",
-    ".pb",
-    ".tar",
-    ".gz",
-    ".xz",
-    ".zip",
-    ".7z",
-    ".rar",
-    ".pdf",
-}
+CODE_EXTS = frozenset(
+    {
+        ".py",
+        ".ipynb",
+        ".md",
+        ".rst",
+        ".txt",
+        ".json",
+        ".yaml",
+        ".yml",
+        ".ini",
+        ".toml",
+        ".cfg",
+        ".sh",
+        ".bat",
+        ".ps1",
+        ".js",
+        ".ts",
+        ".jsx",
+        ".tsx",
+        ".java",
+        ".scala",
+        ".kt",
+        ".c",
+        ".h",
+        ".hpp",
+        ".hh",
+        ".cc",
+        ".cpp",
+        ".m",
+        ".mm",
+        ".go",
+        ".rs",
+        ".rb",
+        ".php",
+        ".pl",
+        ".r",
+        ".swift",
+        ".css",
+        ".scss",
+        ".html",
+        ".xml",
+    }
+)
+BINARY_SKIP_EXTS = frozenset(
+    {
+        ".bin",
+        ".safetensors",
+        ".pt",
+        ".pth",
+        ".onnx",
+        ".tflite",
+        ".pb",
+        ".tar",
+        ".gz",
+        ".xz",
+        ".zip",
+        ".7z",
+        ".rar",
+        ".pdf",
+    }
+)
 
 _GH_LINK_RE = re.compile(r"https?://github\.com/\S+/\S+", re.IGNORECASE)
 
 # -------- URL helpers --------
 
 
+@lru_cache(maxsize=4096)
 def _hf_kind_and_repo_id(url: str) -> tuple[str, str] | None:
     """Return ('model'|'dataset', 'namespace/name') for HF URLs; else None."""
     p = urlparse(url)
@@ -137,14 +140,10 @@ def _resolve_code_repo_for_target(url: str, url_type: str) -> str:
     if hf:
         kind, repo_id = hf
         # Try to read the model/dataset card for an explicit GitHub repo
-        if HF is not None:
+        if hf_info is not None:
             try:
-                info = (
-                    HF.dataset_info(repo_id, files_metadata=False)
-                    if kind == "dataset"
-                    else HF.model_info(repo_id, files_metadata=False)
-                )
-                card = getattr(info, "cardData", None) or {}
+                # the same info fetch the other metrics for this URL share
+                card = getattr(hf_info(kind, repo_id), "cardData", None) or {}
                 # Prefer structured fields
                 for key in ("repository", "source_code", "code", "paper_repository"):
                     v = card.get(key)
@@ -173,27 +172,65 @@ def _resolve_code_repo_for_target(url: str, url_type: str) -> str:
 
 
 def _is_code_like(path: str) -> bool:
-    p = Path(path)
-    ext = p.suffix.lower()
-    if ext in BINARY_SKIP_EXTS:
-        return False
-    if ext in CODE_EXTS:
-        return True
-    try:
-        return ext == "" and p.stat().st_size < 512_000
-    except Exception:
+    # called once per (commit, path): take the suffix by hand instead of via
+    # pathlib. Extensionless paths are not code-like; the clone has no checkout
+    # to stat them against.
+    name = path[path.rfind("/") + 1 :]
+    dot = name.rfind(".")
+    if dot <= 0:
         return False
+    ext = name[dot:].lower()
+    return ext in CODE_EXTS and ext not in BINARY_SKIP_EXTS
 
 
-def _first_author_email(repo: Repo, file_path: str) -> str | None:
+def _first_authors(repo: Repo) -> Dict[str, str]:
+    """
+    Map each file to the email of the commit that added it, from one
+    `git log --diff-filter=A` walk instead of one subprocess per file.
+    """
     try:
         out = repo.git.log(
-            "--diff-filter=A", "--reverse", "--format=%ae", "--", file_path
+            "--diff-filter=A",
+            "--no-renames",
+            "--reverse",
+            "--name-only",
+            "--format=__C__%ae",
         )
-        line = out.splitlines()[0].strip() if out else ""
-        return line or None
     except GitCommandError:
-        return None
+        return {}
+    creators: Dict[str, str] = {}
+    author = ""
+    for line in out.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("__C__"):
+            author = line[5:]
+        elif author:
+            creators.setdefault(line, author)
+    return creators
+
+
+def _changed_files_log(repo: Repo, *args: str) -> str:
+    """
+    Per-commit author + changed paths for HEAD in one `git log --name-only`,
+    rather than one `git show --numstat` per commit via Commit.stats. Paths only
+    need tree objects, so this works on a blob-less partial clone; --no-renames
+    keeps git from fetching blobs to score rename similarity. Merges list what
+    they changed against their first parent, as Commit.stats did, so whoever
+    merges a branch is credited with its files.
+    """
+    try:
+        return repo.git.log(
+            *args,
+            "HEAD",
+            "--no-renames",
+            "--diff-merges=first-parent",
+            "--name-only",
+            "--format=__C__%ae\t%an",
+        )
+    except GitCommandError:
+        return ""
 
 
 def _collect_doa_inputs(
@@ -209,24 +246,22 @@ def _collect_doa_inputs(
     contributors: Dict[str, Set[str]] = defaultdict(set)
     creators: Dict[str, str] = {}
 
-    commits = list(repo.iter_commits("HEAD", since=since_arg)) or list(
-        repo.iter_commits("HEAD")
-    )
-    for c in commits:
-        author = (c.author.email or c.author.name or "unknown").strip().lower()
-        try:
-            changed_files = list(getattr(c.stats, "files", {}).keys())
-        except Exception:
-            changed_files = []
-        for f in changed_files:
-            if not _is_code_like(f):
-                continue
-            dl[f][author] += 1
-            total_by_file[f] += 1
-            contributors[f].add(author)
-
-    for f in list(total_by_file.keys()):
-        creators[f] = _first_author_email(repo, f) or ""
+    out = _changed_files_log(repo, "--since", since_arg) or _changed_files_log(repo)
+    author = "unknown"
+    for f in out.splitlines():
+        if f.startswith("__C__"):
+            email, _, name = f[5:].partition("\t")
+            author = (email or name or "unknown").strip().lower()
+            continue
+        if not f or not _is_code_like(f):
+            continue
+        dl[f][author] += 1
+        total_by_file[f] += 1
+        contributors[f].add(author)
+
+    first_authors = _first_authors(repo)
+    for f in total_by_file:
+        creators[f] = first_authors.get(f, "")
     return dl, total_by_file, contributors, creators
 
 
@@ -251,23 +286,22 @@ def _doa(
 
 def _authors_by_file(dl, total_by_file, contributors, creators) -> Dict[str, Set[str]]:
     authors_of_file: Dict[str, Set[str]] = {}
-    for f in total_by_file.keys():
-        if total_by_file[f] == 0:
+    log1p = math.log1p
+    for f, total in total_by_file.items():
+        authors = contributors.get(f)
+        if total == 0 or not authors:
             authors_of_file[f] = set()
             continue
-        doa_by_author = {
-            a: _doa(a, f, dl, total_by_file, contributors, creators)
-            for a in contributors.get(f, set())
-        }
-        if not doa_by_author:
-            authors_of_file[f] = set()
-            continue
-        max_doa = max(doa_by_author.values())
-        keep: Set[str] = set()
-        for a, val in doa_by_author.items():
-            if val > 3.293 and val > 0.75 * max_doa:
-                keep.add(a)
-        authors_of_file[f] = keep
+        # per-file terms of _doa hoisted out of the author loop
+        dl_f = dl[f]
+        creator = creators.get(f, "").lower()
+        doa_by_author = {}
+        for a in authors:
+            n = dl_f.get(a, 0)
+            fa = 1.098 if creator and creator == a.lower() else 0.0
+            doa_by_author[a] = 3.293 + fa + 0.164 * n - 0.321 * log1p(max(0, total - n))
+        cutoff = max(3.293, 0.75 * max(doa_by_author.values()))
+        authors_of_file[f] = {a for a, val in doa_by_author.items() if val > cutoff}
     return authors_of_file
 
 
@@ -275,35 +309,28 @@ def _compute_bus_factor(authors_of_file: Dict[str, Set[str]]) -> Tuple[int, List
     files = list(authors_of_file.keys())
     if not files:
         return 0, []
-    abandoned: Set[str] = {f for f in files if not authors_of_file[f]}
+    # authors_of_file never changes, so an author's coverage is the same every
+    # round: the greedy removal order is just descending coverage. Track, per
+    # file, how many of its authors are still active instead of re-checking
+    # every file each round.
+    files_of_author: Dict[str, List[str]] = defaultdict(list)
+    remaining: Dict[str, int] = {}
+    for f, authors in authors_of_file.items():
+        remaining[f] = len(authors)
+        for a in authors:
+            files_of_author[a].append(f)
+    abandoned = sum(1 for n in remaining.values() if n == 0)
+    active_authors: Set[str] = set().union(*authors_of_file.values())
     removed: List[str] = []
-    active_authors: Set[str] = (
-        set().union(*authors_of_file.values()) if authors_of_file else set()
-    )
-
-    def recompute_abandoned(current_removed: Set[str]) -> Set[str]:
-        new_abandoned = set(abandoned)
-        for f in files:
-            if f in new_abandoned:
-                continue
-            if authors_of_file[f] and authors_of_file[f].issubset(current_removed):
-                new_abandoned.add(f)
-        return new_abandoned
-
-    current_removed: Set[str] = set(removed)
-    while True:
-        if len(abandoned) > 0.5 * len(files):
-            return len(removed), removed
-        if not active_authors:
-            return len(removed), removed
-        coverage = {
-            a: sum(1 for f in files if a in authors_of_file[f]) for a in active_authors
-        }
-        top_author = max(coverage.items(), key=lambda kv: kv[1])[0]
-        removed.append(top_author)
-        current_removed.add(top_author)
-        active_authors.remove(top_author)
-        abandoned = recompute_abandoned(current_removed)
+    for a in sorted(active_authors, key=lambda a: -len(files_of_author[a])):
+        if abandoned > 0.5 * len(files):
+            break
+        removed.append(a)
+        for f in files_of_author[a]:
+            remaining[f] -= 1
+            if remaining[f] == 0:
+                abandoned += 1
+    return len(removed), removed
 
 
 def _normalize_score(bus_factor: int, authors_of_file: Dict[str, Set[str]]) -> float:
@@ -319,13 +346,13 @@ def _normalize_score(bus_factor: int, authors_of_file: Dict[str, Set[str]]) -> f
 
 def get_bus_factor(
     url: str, url_type: str, since_days: int = SINCE_DAYS_DEFAULT
-) -> Tuple[float, int]:
+) -> Tuple[Optional[float], int]:
     """
     Resolve to a *code* repository (GitHub if available), compute bus factor, and
-    return (score, latency_ms).
+    return (score, latency_ms); score is None if the repo could not be read.
     """
     start = time.time()
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = make_clone_dir()
     try:
         clone_url = _resolve_code_repo_for_target(url, url_type)
         env = os.environ.copy()
@@ -333,7 +360,8 @@ def get_bus_factor(
         repo = Repo.clone_from(
             clone_url,
             temp_dir,
-            multi_options=["--depth=200"],  # shallow history speeds things up
+            # shallow, blob-less history: only commits and trees are read
+            multi_options=["--depth=200", "--filter=blob:none", "--no-checkout"],
             env=env,
         )
 
@@ -349,7 +377,7 @@ def get_bus_factor(
         return score, int((time.time() - start) * 1000)
 
     except Exception:
-        # No prints to stdout; caller will include this metric in the average
-        return 0.0, int((time.time() - start) * 1000)
+        # No prints to stdout; None (not 0.0) so the failure is not cached
+        return None, int((time.time() - start) * 1000)
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -6,43 +6,205 @@ import os
 import shutil
 import tempfile
 import time
+import logging
 import subprocess
-import sys
-from git import Repo
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, NamedTuple, Optional
 import ast
-import re
-
-
-def run_radon(path: str) -> float:
+import hashlib
+from functools import lru_cache
+import lizard
+from radon.metrics import h_visit_ast, mi_compute, mi_rank
+from radon.raw import analyze
+from radon.visitors import ComplexityVisitor
+
+from .scratch import make_clone_dir
+
+try:
+    from ..utils import cache
+    from ..utils.cache import memoized
+except ImportError:  # run as a script: src/scorer is on sys.path, not a package
+    from utils import cache
+    from utils.cache import memoized
+
+log = logging.getLogger(__name__)
+
+# bump when the scoring in _check_code_repo_quality changes, so results cached
+# under an unchanged commit SHA are recomputed
+_SCORE_VERSION = 2
+# per-clone budget; past either limit the clone is abandoned and scored 0
+_CLONE_TIMEOUT_S = float(os.environ.get("SCORER_CLONE_TIMEOUT", "120"))
+_CLONE_MAX_BYTES = int(os.environ.get("SCORER_CLONE_MAX_MB", "500")) * 1024 * 1024
+_CLONE_POLL_S = 0.25
+# full checkouts go to tmpfs only when it has this much room left
+_TMPFS_MIN_FREE = 2 * 1024 * 1024 * 1024
+# a commit's contents never change, so per-SHA scores can live much longer than
+# the default URL-keyed TTL
+_SHA_CACHE_TTL = 30 * 86_400
+
+
+# (radon MI rank or None, defs, documented defs) for one file
+_FileScan = Tuple[Optional[str], int, int]
+
+
+class _PythonScan(NamedTuple):
+    mi_ranks: List[str]  # radon MI rank of each file `radon mi` would score
+    total_defs: int  # functions (sync and async) + classes in every .py file
+    documented_defs: int  # ... of which have a docstring
+
+
+# vendored, generated, cache and environment directories: no signal about the
+# repo's own code, and often most of its files. Hidden directories are skipped too.
+_PRUNE_DIRS = frozenset(
+    (
+        "node_modules",
+        "venv",
+        "env",
+        "__pycache__",
+        "site-packages",
+        "dist",
+        "build",
+    )
+)
+
+
+def _walk(path: str):
+    # os.walk yielding (root, files), without descending into pruned directories
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in _PRUNE_DIRS and not d.startswith(".")]
+        yield root, files
+
+
+def _has_python_shebang(path: str) -> bool:
+    try:
+        with open(path) as fh:
+            first_line = fh.readline()
+    except Exception:
+        return False
+    return first_line.startswith("#!") and "python" in first_line
+
+
+_DEF_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# the only fields that hold statement lists, so the only places a def can appear
+_STMT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
+def _iter_defs(tree: ast.AST):
+    # like ast.walk filtered to defs, but never descends into expressions
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for field in _STMT_FIELDS:
+            children = getattr(node, field, None)
+            if not isinstance(children, list):  # Lambda/IfExp have an expr body
+                continue
+            for child in children:
+                if isinstance(child, _DEF_NODES):
+                    yield child
+                stack.append(child)
+
+
+def _mi_from_tree(source: str, tree: ast.AST) -> float:
+    # radon.metrics.mi_visit(source, multi=True), reusing an already parsed tree
+    raw = analyze(source)
+    comments = (raw.comments + raw.multi) / raw.sloc * 100 if raw.sloc else 0
+    return mi_compute(
+        h_visit_ast(tree).total.volume,
+        ComplexityVisitor.from_ast(tree).total_complexity,
+        raw.lloc,
+        comments,
+    )
+
+
+def _scan_file(data: bytes, for_radon: bool, is_py: bool) -> _FileScan:
+    # ast.parse decodes bytes itself (BOM and coding cookie included)
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError):
+        try:
+            tree = ast.parse(data.decode("utf-8", errors="ignore"))
+        except (SyntaxError, ValueError):
+            return (None, 0, 0)
+    rank = None
+    if for_radon:
+        # radon reads files as strict utf-8 text and reports undecodable ones as
+        # errors; docstrings still count them
+        try:
+            source = data.decode("utf-8")
+            if "\r" in source:  # text-mode universal newlines
+                source = source.replace("\r\n", "\n").replace("\r", "\n")
+            rank = mi_rank(_mi_from_tree(source, tree))
+        except Exception:
+            pass
+    total = documented = 0
+    if is_py:
+        for node in _iter_defs(tree):
+            total += 1
+            if ast.get_docstring(node):
+                documented += 1
+    return (rank, total, documented)
+
+
+def _scan_python(path: str) -> _PythonScan:
+    """
+    Walk the repo once, reading and parsing each Python file a single time for both
+    the maintainability index and the docstring counts. Per-file results are
+    cached by content hash, so files already seen in another repo, commit or run
+    are not parsed again.
+    """
+    ranks: List[str] = []
+    total = 0
+    documented = 0
+    for root, files in _walk(path):
+        pending = {}  # cache key -> (data, for_radon, is_py)
+        keys = []
+        for file in files:
+            full = os.path.join(root, file)
+            is_py = file.endswith(".py")
+            # radon also skips hidden files and picks up python-shebang scripts
+            for_radon = not file.startswith(".") and (
+                is_py or _has_python_shebang(full)
+            )
+            if not (is_py or for_radon):
+                continue
+            try:
+                with open(full, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            key = cache.make_key(
+                "py_scan",
+                (hashlib.sha1(data).hexdigest(), for_radon, is_py, _SCORE_VERSION),
+            )
+            keys.append(key)
+            pending[key] = (data, for_radon, is_py)
+        # one lookup and one write per directory
+        results = cache.get_many(pending)
+        fresh = {
+            key: _scan_file(*args)
+            for key, args in pending.items()
+            if key not in results
+        }
+        cache.put_many(fresh, ttl=_SHA_CACHE_TTL)
+        results.update(fresh)
+        for key in keys:
+            rank, n_defs, n_documented = results[key]
+            if rank is not None:
+                ranks.append(rank)
+            total += n_defs
+            documented += n_documented
+    return _PythonScan(ranks, total, documented)
+
+
+def run_radon(path: str, scan: Optional[_PythonScan] = None) -> float:
     """
     Function to run radon, a Python tool that analyzes source code complexity and
     maintainability.
     """
-    cmds = [
-        [sys.executable, "-m", "radon", "mi", "-s", path],  # preferred
-        ["radon", "mi", "-s", path],  # fallback
-    ]
-
-    result = None
-    for cmd in cmds:
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            break
-        except FileNotFoundError:
-            continue
-        except subprocess.CalledProcessError:
-            return 0.0
-
-    if result is None:
-        return 0.0
-
+    # ranks as `radon mi -s path` gives them, minus the _PRUNE_DIRS trees
+    if scan is None:
+        scan = _scan_python(path)
     score_map = {"A": 1.0, "B": 0.8, "C": 0.6, "D": 0.4, "E": 0.2, "F": 0.0}
-    vals = []
-    for line in result.stdout.splitlines():
-        if " - " in line:
-            grade = line.split(" -")[-1].strip()[:1]
-            vals.append(score_map.get(grade, 0.0))
+    vals = [score_map.get(rank, 0.0) for rank in scan.mi_ranks]
     return sum(vals) / len(vals) if vals else 0.0
 
 
@@ -51,39 +213,32 @@ def run_lizard(path: str) -> Optional[Dict]:
     Function to run lizard, a multi-language code analysis tool that analyzes function
     complexity.
     """
-
-    for cmd in ([sys.executable, "-m", "lizard", path], ["lizard", path]):
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            break
-        except FileNotFoundError:
-            result = None
-            continue
-        except subprocess.CalledProcessError:
-            return None
-    if result is None:
-        return None
-
-    if result.returncode != 0:
-        # print("Lizard failed with non-zero exit code.")
+    try:
+        options = lizard.parse_args(["lizard", path])
+        lizard.OutputScheme(options.extensions).patch_for_extensions()
+        file_infos = [
+            fi
+            for fi in lizard.analyze(
+                options.paths,
+                options.exclude,
+                1,
+                options.extensions,
+                options.languages,
+                options.use_gitignore,
+            )
+            if fi
+        ]
+        warnings = list(lizard.get_warnings(file_infos, options))
+    except Exception:
         return None
 
-    # find the last summary row using regex
-    total_row = None
-    for line in result.stdout.splitlines():
-        # match a line that starts with spaces then numbers/floats
-        if re.match(r"^\s*\d+", line.strip()):
-            total_row = line.strip()
-
-    if not total_row:
-        print("Could not find totals in Lizard output")
+    # the lizard CLI exits non-zero when any function exceeds a warning threshold,
+    # which the subprocess-based version treated as a failed run; keep that
+    if warnings:
         return None
 
-    # extract numeric values from the totals row
-    parts = total_row.split()
-    if len(parts) < 8:
-        print("Unexpected totals format:", total_row)
-        return None
+    all_result = lizard.AllResult(file_infos)
+    module = all_result.as_fileinfo()
 
     # NLOC = non-comment lines of code
     # CNN = cyclomatic complexity number - measures paths through function
@@ -92,16 +247,16 @@ def run_lizard(path: str) -> Optional[Dict]:
     # length = total lines of code, including comments
     # location = path where function is defined
 
-    # put values into a dict
+    # put values into a dict (rounded as in the CLI totals row)
     totals = {
-        "Total NLOC": float(parts[0]),
-        "Avg NLOC": float(parts[1]),
-        "Avg CCN": float(parts[2]),
-        "Avg Tokens": float(parts[3]),
-        "Function Count": int(parts[4]),
-        "Warning Count": int(parts[5]),
-        "Function Rate": float(parts[6]),
-        "NLOC Rate": float(parts[7]),
+        "Total NLOC": float(module.nloc),
+        "Avg NLOC": round(module.average_nloc, 1),
+        "Avg CCN": round(module.average_cyclomatic_complexity, 1),
+        "Avg Tokens": round(module.average_token_count, 1),
+        "Function Count": all_result.function_count(),
+        "Warning Count": 0,
+        "Function Rate": 0.0,
+        "NLOC Rate": 0.0,
     }
     return totals
 
@@ -158,101 +313,147 @@ def score_from_lizard_totals(totals: dict) -> float:
     return final_score
 
 
-def docstring_ratio(path: str) -> float:
+def docstring_ratio(path: str, scan: Optional[_PythonScan] = None) -> float:
     """
     Function to count how many Python functions or classes have docstrings.
     """
-    total = 0
-    documented = 0
-    score = 0
+    if scan is None:
+        scan = _scan_python(path)
+    if not scan.total_defs:
+        # no functions or classes (or no Python at all): nothing is documented
+        return 0.0
+    score = scan.documented_defs / scan.total_defs
+    return score
 
+
+class CloneBudgetExceeded(Exception):
+    """
+    The clone ran past _CLONE_TIMEOUT_S or _CLONE_MAX_BYTES and was killed.
+    """
+
+
+def _dir_bytes(path: str) -> int:
+    total = 0
     for root, _, files in os.walk(path):
-        for file in files:
-            if file.endswith(".py"):
-                with open(
-                    os.path.join(root, file), "r", encoding="utf-8", errors="ignore"
-                ) as fh:
-                    try:
-                        tree = ast.parse(fh.read())
-                        for node in ast.walk(tree):
-                            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                                total += 1
-                                if ast.get_docstring(node):
-                                    documented += 1
-                    except Exception:
-                        continue
-
-    score = documented / total
-    return score
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _git_env() -> Dict[str, str]:
+    env = os.environ.copy()
+    env.setdefault("GIT_LFS_SKIP_SMUDGE", "1")
+    # fail instead of waiting on a credential prompt for private/missing repos
+    env.setdefault("GIT_TERMINAL_PROMPT", "0")
+    return env
+
+
+def _shallow_clone(code_url: str, dest: str) -> None:
+    """
+    Clone only the current tree (no history, tags or LFS blobs), killing git if it
+    exceeds the time or received-size budget so one huge repo cannot stall a run.
+    """
+    cmd = ["git", "clone", "--depth=1", "--single-branch", "--no-tags"]
+    cmd += ["--", code_url, dest]
+    git_dir = os.path.join(dest, ".git")
+    deadline = time.monotonic() + _CLONE_TIMEOUT_S
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=_git_env()
+    ) as proc:
+        while True:
+            try:
+                _, err = proc.communicate(timeout=_CLONE_POLL_S)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            # the pack being received is written under .git as it arrives
+            if time.monotonic() > deadline or _dir_bytes(git_dir) > _CLONE_MAX_BYTES:
+                proc.kill()
+                proc.communicate()
+                raise CloneBudgetExceeded(code_url)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, stderr=err.decode(errors="replace")
+        )
+
+
+def _has_test_file(path: str) -> bool:
+    # stops at the first file with "test" in its name
+    for _, files in _walk(path):
+        if any("test" in file.lower() for file in files):
+            return True
+    return False
 
 
-def _check_code_repo_quality(code_url: str) -> float:
+def _check_code_repo_quality(code_url: str) -> Optional[float]:
     """
     Function to analyze the quality of the code.
+    None if the repo could not be cloned.
     """
 
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = make_clone_dir(_TMPFS_MIN_FREE)
     try:
         # clone the repo
         try:
-            Repo.clone_from(code_url, temp_dir)
+            try:
+                _shallow_clone(code_url, temp_dir)
+            except subprocess.CalledProcessError as e:
+                if "No space left on device" not in e.stderr:
+                    raise
+                # tmpfs filled up (other clones share it): retry on disk
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                temp_dir = tempfile.mkdtemp()
+                _shallow_clone(code_url, temp_dir)
+        except CloneBudgetExceeded:
+            raise
         except Exception as e:
-            print(f"Cannot clone repo for code quality check: {e}")
-            exit(1)
-        # first reliability check - check for the word test in the files
-        reliability = 0.0
-        for _, _, files in os.walk(temp_dir):
-            for file in files:
-                if "test" in file.lower():
-                    reliability = 0.7
-                    break
-        # second reliability check - check for testing frameworks
-        file_names = os.listdir(temp_dir)
-        file_names_str = " ".join(file_names).lower()
-
-        frameworks = ["pytest", "unittest", "mocha", "jest"]
-        found_framework = False
-
-        for fw in frameworks:
-            if fw in file_names_str:
-                found_framework = True
-                break
+            # this runs in a pool worker: exiting would take the whole CLI run
+            # (and its unwritten rows) down with it
+            log.warning("cannot clone repo for code quality check %s: %s", code_url, e)
+            return None
+        # top-level entries, read once for the reliability, testability,
+        # portability and README checks below
+        top_level = set(os.listdir(temp_dir))
 
-        if found_framework:
+        # reliability - testing frameworks named at the top level, else the word
+        # test in any file name
+        reliability = 0.0
+        frameworks = ("pytest", "unittest", "mocha", "jest")
+        if any(fw in name.lower() for name in top_level for fw in frameworks):
             reliability = 1.0
+        elif _has_test_file(temp_dir):
+            reliability = 0.7
 
         # check complexity (number of files and classes, complexity, etc)
-        radon_score = run_radon(temp_dir)
-        lizard_totals = run_lizard(temp_dir)
+        scan = _scan_python(temp_dir)
+        radon_score = run_radon(temp_dir, scan)
         lizard_score = 0.0
-        if lizard_totals:
-            lizard_score = score_from_lizard_totals(lizard_totals)
+        # lizard scores at most 1.0, so it cannot raise a perfect radon score
+        if radon_score < 1.0:
+            lizard_totals = run_lizard(temp_dir)
+            if lizard_totals:
+                lizard_score = score_from_lizard_totals(lizard_totals)
         complexity = max(radon_score, lizard_score)
 
         # check testabilty (CI/CD configs)
         testability = 0.0
-        for ci in [".github", ".gitlab-ci.yml", "azure-pipelines.yml"]:
-            if os.path.exists(os.path.join(temp_dir, ci)):
-                testability = 1.0
-                break
+        if top_level.intersection((".github", ".gitlab-ci.yml", "azure-pipelines.yml")):
+            testability = 1.0
 
         # check portability (check enviornment files)
         portability = 0.0
-        if os.path.exists(os.path.join(temp_dir, "Dockerfile")):
+        if "Dockerfile" in top_level:
             portability += 0.5
-        if os.path.exists(os.path.join(temp_dir, "requirements.txt")) or os.path.exists(
-            os.path.join(temp_dir, "environment.yml")
-        ):
+        if "requirements.txt" in top_level or "environment.yml" in top_level:
             portability += 0.5
 
         # reusability (check for README and docstrings)
-        readme_path = os.path.join(temp_dir, "README.md")
-        if os.path.exists(readme_path):
-            readme_bonus = 0.5
-        else:
-            readme_bonus = 0
+        readme_bonus = 0.5 if "README.md" in top_level else 0
 
-        reusability = max(docstring_ratio(temp_dir), readme_bonus)
+        reusability = max(docstring_ratio(temp_dir, scan), readme_bonus)
 
         # compute weighted score
         final_score = (
@@ -270,17 +471,60 @@ def _check_code_repo_quality(code_url: str) -> float:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-def get_code_quality(url: str, url_type: str) -> Tuple[float, int]:
+def _remote_head_sha(url: str) -> Optional[str]:
+    """
+    Commit SHA of the remote's HEAD, via one `git ls-remote` (no clone).
+    """
+    try:
+        out = subprocess.run(
+            ["git", "ls-remote", url, "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=_CLONE_TIMEOUT_S,
+            env=_git_env(),
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    sha = out.split("\t", 1)[0].strip()
+    return sha or None
+
+
+@lru_cache(maxsize=256)
+def _code_quality_score(url: str) -> Optional[float]:
+    """
+    Score for a code repo URL, computed at most once per process (even with the
+    on-disk cache disabled); repeat calls skip the ls-remote as well.
+    """
+    # the same commit is only cloned and analyzed once across runs
+    sha = _remote_head_sha(url)
+    if not sha:
+        return _check_code_repo_quality(url)
+    return memoized(
+        "code_quality_sha",
+        (sha, _SCORE_VERSION),
+        lambda: _check_code_repo_quality(url),
+        ttl=_SHA_CACHE_TTL,
+    )
+
+
+def get_code_quality(url: str, url_type: str) -> Tuple[Optional[float], int]:
     """
     Function to get code quality if URL is a GitHub link.
+    The score is None when the repo could not be cloned (or not within budget).
     """
 
     start_time = time.time()
-    score = 0.0
+    score: Optional[float] = 0.0
 
     if url_type == "code":
-        # clone GitHub repo and check readme for performance claims
-        score = _check_code_repo_quality(url)
+        try:
+            score = _code_quality_score(url)
+        except CloneBudgetExceeded:
+            # None, not 0.0: the CLI's per-URL memoized skips (None, latency),
+            # so an over-budget repo is retried next run rather than pinned at 0
+            log.warning("clone over budget, code quality not scored: %s", url)
+            score = None
     latency = int((time.time() - start_time) * 1000)
     return score, latency
 
@@ -4,46 +4,19 @@ Dataset and code metrics.
 - Look for example code/scripts (training, evaluation, requirements).
 """
 
-import os
 import time
 import re
 from dotenv import load_dotenv
-from huggingface_hub import HfApi, login
 from .base import get_repo_id
+from .session import ensure_hf_login, hf_info
 
 load_dotenv()
 # HF_TOKEN = os.getenv("HF_Token")
-HF_API = HfApi()
 # login(token=HF_TOKEN)
 
 
-def _maybe_login() -> None:
-    """
-    Log in non-interactively only if a token is present.
-    Never prompt, never run at import time.
-    """
-    token = (
-        os.getenv("HF_TOKEN")  # preferred
-        or os.getenv("HF_Token")  # be forgiving if someone used this
-        or os.getenv("HUGGINGFACE_TOKEN")  # extra alias, optional
-    )
-    if not token:
-        return
-    try:
-        # No interactive questions, no new session popups
-        login(
-            token=token,
-            add_to_git_credential=False,
-            write_permission=False,
-            new_session=False,
-        )
-    except Exception:
-        # Swallow login issues; callers should still work anonymously where possible
-        pass
-
-
 def get_dataset_and_code_score(url: str, url_type: str):
-    _maybe_login()
+    ensure_hf_login()
     start_time = time.time()
 
     try:
@@ -56,9 +29,9 @@ def get_dataset_and_code_score(url: str, url_type: str):
     # Fetch README
     try:
         if url_type == "model":
-            repo_info = HF_API.model_info(repo_id=repo_id, files_metadata=True)
+            repo_info = hf_info("model", repo_id)
         elif url_type == "dataset":
-            repo_info = HF_API.dataset_info(repo_id=repo_id, files_metadata=True)
+            repo_info = hf_info("dataset", repo_id)
         else:
             latency = int((time.time() - start_time) * 1000)
             print("dataset_and_code_score only applicable to model/dataset")
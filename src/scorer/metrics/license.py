@@ -3,12 +3,10 @@ Implementing license metric scoring by seeing if
 the license is compatible with LGPLv2.1
 """
 
-import os
-import requests
 import time
 from dotenv import load_dotenv
-from huggingface_hub import HfApi, login
 from .base import get_repo_id
+from .session import ensure_hf_login, github_get, hf_info
 from typing import Tuple, Optional
 
 # suppress logging from Hugging Face
@@ -18,35 +16,13 @@ logging.getLogger("huggingface_hub").setLevel(logging.ERROR)
 
 load_dotenv()
 # HF_TOKEN = os.getenv("HF_Token")
-HF_API = HfApi()
 # login(token=HF_TOKEN)
 
-compatible_licenses = ["apache-2.0", "mit", "bsd-2-clause", "bsd-3-clause", "lgpl-2.1"]
-
-
-def _maybe_login() -> None:
-    """
-    Log in non-interactively only if a token is present.
-    Never prompt, never run at import time.
-    """
-    token = (
-        os.getenv("HF_TOKEN")  # preferred
-        or os.getenv("HF_Token")  # be forgiving if someone used this
-        or os.getenv("HUGGINGFACE_TOKEN")  # extra alias, optional
-    )
-    if not token:
-        return
-    try:
-        # No interactive questions, no new session popups
-        login(
-            token=token,
-            add_to_git_credential=False,
-            write_permission=False,
-            new_session=False,
-        )
-    except Exception:
-        # Swallow login issues; callers should still work anonymously where possible
-        pass
+compatible_licenses = frozenset(
+    ["apache-2.0", "mit", "bsd-2-clause", "bsd-3-clause", "lgpl-2.1"]
+)
+# API spellings of the licenses above
+_COMPATIBLE_PREFIXES = ("apache", "mit", "bsd 2-clause", "bsd 3-clause", "lgpl v2.1")
 
 
 # Normalize license names from HF/GitHub API
@@ -57,22 +33,16 @@ def is_compatible(license: str) -> bool:
 
     normalized = license.lower().strip()
 
-    if normalized.startswith("apache"):
-        normalized = "apache-2.0"
-    elif normalized.startswith("mit"):
-        normalized = "mit"
-    elif normalized.startswith("bsd 2-clause"):
-        normalized = "bsd-2-clause"
-    elif normalized.startswith("bsd 3-clause"):
-        normalized = "bsd-3-clause"
-    elif normalized.startswith("lgpl v2.1"):
-        normalized = "lgpl-2.1"
-
-    return normalized in compatible_licenses
+    # HF card licenses and GitHub SPDX ids are usually canonical already: one set
+    # lookup. Every other name starting with one of the prefixes normalizes to a
+    # compatible license (e.g. "apache 2.0" -> "apache-2.0").
+    return normalized in compatible_licenses or normalized.startswith(
+        _COMPATIBLE_PREFIXES
+    )
 
 
 def get_license_score(url: str, url_type: str) -> Tuple[Optional[int], int]:
-    _maybe_login()
+    ensure_hf_login()
     start_time = time.time()
 
     # Get repo id
@@ -85,17 +55,27 @@ def get_license_score(url: str, url_type: str) -> Tuple[Optional[int], int]:
 
     license = None
     if url_type == "model":
-        info = HF_API.model_info(repo_id=repo_id)
+        info = hf_info("model", repo_id)
         license = getattr(info, "license", None) or (info.cardData or {}).get("license")
 
     elif url_type == "dataset":
-        info = HF_API.dataset_info(repo_id=repo_id)
+        info = hf_info("dataset", repo_id)
         license = getattr(info, "license", None)
 
     elif url_type == "code":
-        base_url = f"https://api.github.com/repos/{repo_id}"
-        license_info = requests.get(f"{base_url}/license").json()
-        license = license_info.get("license", {}).get("name")
+        # the repo summary already names the license (without its text), and is
+        # the same ETag-cached response the size metric reads
+        resp = github_get(f"https://api.github.com/repos/{repo_id}")
+        if resp.status_code != 200:
+            # rate limited or unreachable: unknown, not incompatible
+            return None, int((time.time() - start_time) * 1000)
+        repo_info = resp.json()
+        gh_license = repo_info.get("license") or {}
+        # SPDX ids ("LGPL-2.1") are canonical; names are free text
+        spdx_id = gh_license.get("spdx_id")
+        if spdx_id == "NOASSERTION":
+            spdx_id = None
+        license = spdx_id or gh_license.get("name")
 
     # print(f"License for {url} is {license}")
 
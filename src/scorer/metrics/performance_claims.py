@@ -4,23 +4,35 @@ Evaluate model performance claims.
 
 import os
 import shutil
-import tempfile
 import time
-from typing import Tuple
+from typing import List, Optional, Tuple
+import requests
 from git import Repo
 from huggingface_hub import hf_hub_download
+from huggingface_hub.utils import EntryNotFoundError
 from dotenv import load_dotenv
 from pathlib import Path
 import re
+import logging
 
+from .base import get_repo_id
+from .scratch import make_clone_dir
+from .session import github_get, hf_info
 
-def get_performance_claims(url: str, url_type: str) -> Tuple[float, int]:
+log = logging.getLogger(__name__)
+
+# read once at import rather than re-parsing .env for every model URL
+load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
+
+
+def get_performance_claims(url: str, url_type: str) -> Tuple[Optional[float], int]:
     """
     Function to get model or code performance claims based on URL type.
+    The score is None when the README could not be fetched.
     """
 
     start_time = time.time()
-    score = 0.0
+    score: Optional[float] = 0.0
 
     if url_type == "code":
         # clone GitHub repo and check readme for performance claims
@@ -34,52 +46,107 @@ def get_performance_claims(url: str, url_type: str) -> Tuple[float, int]:
     return score, latency
 
 
-def _check_code_repo_performance(code_url: str) -> float:
+def _check_code_repo_performance(code_url: str) -> Optional[float]:
     """
     Function to check the code repo for performance claims.
     """
 
-    score = 0.0
-    temp_dir = tempfile.mkdtemp()
+    # README and top-level listing over the GitHub API; clone only as a fallback
+    found = _fetch_readme_and_listing(code_url)
+    if found is None:
+        found = _clone_readme_and_listing(code_url)
+    if found is None:
+        return None
+    text, names = found
+
+    # check README file
+    keywords = ["benchmark", "evaluation", "performance"]
+    score = _keyword_score(text.lower(), keywords)
+
+    # check for any test or evaluation scripts (stops at the first one)
+    if any("test" in name or "eval" in name for name in map(str.lower, names)):
+        score = max(score, 0.7)
 
+    return score
+
+
+def _fetch_readme_and_listing(code_url: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    README.md text ("" if absent) and top-level names for a GitHub repo, from two
+    REST calls on the shared session. None when the API cannot answer.
+    """
+    repo_id = get_repo_id(code_url, "code")
+    if not repo_id:
+        return None
+    base_url = f"https://api.github.com/repos/{repo_id}/contents"
+    try:
+        listing = github_get(f"{base_url}/")
+        if listing.status_code != 200:
+            return None
+        names = [entry["name"] for entry in listing.json()]
+        text = ""
+        if "README.md" in names:
+            readme = github_get(
+                f"{base_url}/README.md", Accept="application/vnd.github.raw"
+            )
+            if readme.status_code != 200:
+                return None
+            text = readme.content.decode("utf-8", errors="ignore")
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
+    return text, names
+
+
+def _clone_readme_and_listing(code_url: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Same as _fetch_readme_and_listing, from a clone (non-GitHub hosts, or when the
+    API is rate limited or unreachable). Only the tip commit's trees and the
+    README blob are transferred; nothing is checked out.
+    """
+    temp_dir = make_clone_dir()
     try:
         # clone the repo
         try:
-            Repo.clone_from(code_url, temp_dir)
+            env = os.environ.copy()
+            env.setdefault("GIT_LFS_SKIP_SMUDGE", "1")  # never pull LFS weights
+            repo = Repo.clone_from(
+                code_url,
+                temp_dir,
+                multi_options=[
+                    "--depth=1",
+                    "--single-branch",
+                    "--filter=blob:none",
+                    "--no-checkout",
+                ],
+                env=env,
+            )
+            names = repo.git.ls_tree("--name-only", "HEAD").splitlines()
         except Exception as e:
-            print(f"Cannot clone repo: {e}")
-            return 0.0
+            log.debug("cannot clone repo %s: %s", code_url, e)
+            return None
 
-        # check README file
-        readme_path = os.path.join(temp_dir, "README.md")
+        # check README file (its blob is fetched on demand)
         text = ""
-        if os.path.exists(readme_path):
+        if "README.md" in names:
             try:
-                with open(readme_path, "r", encoding="utf-8", errors="ignore") as f:
-                    text = f.read().lower()
+                blob = repo.git.cat_file(
+                    "blob", "HEAD:README.md", stdout_as_string=False
+                )
+                text = blob.decode("utf-8", errors="ignore")
             except Exception:
-                print("Cannot open readme")
-        keywords = ["benchmark", "evaluation", "performance"]
-        score = _keyword_score(text, keywords)
-
-        # check for any test or evaluation scripts
-        for filename in os.listdir(temp_dir):
-            if "test" in filename.lower() or "eval" in filename.lower():
-                score = max(score, 0.7)
+                log.debug("cannot read README.md of %s", code_url)
+        return text, names
 
     # remove the repo
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
-    return score
-
 
-def _check_model_card_performance(model_url: str) -> float:
+def _check_model_card_performance(model_url: str) -> Optional[float]:
     """
     Function to check the model card/README on Hugging Face for performance claims.
     """
 
-    load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
     hf_token = os.getenv("HF_TOKEN")
 
     score = 0.0
@@ -100,91 +167,132 @@ def _check_model_card_performance(model_url: str) -> float:
         model_id = model_id.split("/tree")[0]
         model_id = model_id.split("/blob")[0]
 
-        # download README.md from the repo
+        # download README.md from the repo, pinned to the current commit: a cached
+        # copy of a commit-pinned file is served without any request, where
+        # "main" costs a HEAD round trip each time (the info is shared with the
+        # other metrics for this model). The pin is only an optimization: if the
+        # info fetch fails (rate limit, gated repo, timeout), use "main"
+        try:
+            revision = getattr(hf_info("model", model_id), "sha", None)
+        except Exception as e:
+            log.debug("no revision for %s, reading main: %s", model_id, e)
+            revision = None
         readme_path = hf_hub_download(
-            repo_id=model_id, filename="README.md", token=hf_token
+            repo_id=model_id, filename="README.md", revision=revision, token=hf_token
         )
 
         # read full text
         with open(readme_path, "r", encoding="utf-8") as f:
-            text = f.read().lower()
-
-        # define keywords to check in the readme
-        sentences = re.split(r"[.!?]", text)
-        keywords = [
-            "benchmark",
-            "evaluation",
-            "performance",
-            "metric",
-            "score",
-            "result",
-            "outcome",
-            "effectiveness",
-            "efficacy",
-            "validation",
-            "accuracy",
-            "f1",
-            "precision",
-            "recall",
-            "auc",
-            "roc",
-            "top-1",
-            "top-5",
-            "mse",
-            "mae",
-            "rmse",
-            "loss",
-            "cross-entropy",
-            "log-loss",
-            "bleu",
-            "rouge",
-            "meteor",
-            "perplexity",
-            "iou",
-            "ap",
-            "map",
-            "precision-recall",
-            "latency",
-            "throughput",
-            "fps",
-            "speed",
-            "memory",
-            "params",
-            "size",
-            "parameter",
-            "parameters",
-            "recognition",
-            "beneficial",
-        ]
-
-        # Keep track of keywords that have already been counted
-        counted_keywords = set()
-        keyword_count = 0
-
-        for sent in sentences:
-            sent_lower = sent.lower()
-            for kw in keywords:
-                # match whole word only using \b for word boundaries
-                if re.search(rf"\b{re.escape(kw)}\b", sent_lower):
-                    if kw not in counted_keywords:
-                        # bonus if numeric value present
-                        if re.search(r"\b\d+(\.\d+)?%?\b", sent_lower):
-                            keyword_count += 2
-                        else:
-                            keyword_count += 1
-                        counted_keywords.add(kw)
-                        # print(kw)
-
-        score = min(keyword_count / 10, 1.0)
+            text = f.read(_CARD_MAX_CHARS).lower()
+
+        keyword_count = _card_keyword_count(text)
+        score = min(keyword_count / _CARD_SATURATION, 1.0)
 
         # print(f"Number of performance keywords = {keyword_count}")
 
+    except EntryNotFoundError:
+        pass  # no model card, so no claims
     except Exception as e:
-        print(f"Error checking model card: {e}")
+        log.debug("error checking model card %s: %s", model_url, e)
+        return None
 
     return round(score, 2)
 
 
+# model-card terms that signal performance claims
+_CARD_KEYWORDS = frozenset(
+    [
+        "benchmark",
+        "evaluation",
+        "performance",
+        "metric",
+        "score",
+        "result",
+        "outcome",
+        "effectiveness",
+        "efficacy",
+        "validation",
+        "accuracy",
+        "f1",
+        "precision",
+        "recall",
+        "auc",
+        "roc",
+        "top-1",
+        "top-5",
+        "mse",
+        "mae",
+        "rmse",
+        "loss",
+        "cross-entropy",
+        "log-loss",
+        "bleu",
+        "rouge",
+        "meteor",
+        "perplexity",
+        "iou",
+        "ap",
+        "map",
+        "precision-recall",
+        "latency",
+        "throughput",
+        "fps",
+        "speed",
+        "memory",
+        "params",
+        "size",
+        "parameter",
+        "parameters",
+        "recognition",
+        "beneficial",
+    ]
+)
+# the score is min(count / _CARD_SATURATION, 1.0), so counting stops there
+_CARD_SATURATION = 10
+# claims live near the top of a card; huge cards are only read this far
+_CARD_MAX_CHARS = 256 * 1024
+_CARD_KEYWORD_MAX_PARTS = max(kw.count("-") + 1 for kw in _CARD_KEYWORDS)
+# a sentence break, or a run of words joined by single hyphens ("top-1")
+_SENTENCE_BREAK_OR_WORDS = re.compile(r"[.!?]|\w+(?:-\w+)*")
+_SENTENCE_BREAK = re.compile(r"[.!?]")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?%?\b")
+
+
+def _card_keyword_count(text: str) -> int:
+    """
+    Count the distinct _CARD_KEYWORDS appearing as whole words in text: 2 for a
+    keyword whose first sentence also has a number in it, else 1. One regex pass
+    over the text instead of a search per keyword per sentence, stopping early
+    once the count reaches _CARD_SATURATION.
+    """
+    counted = set()
+    count = 0
+    start = 0  # of the current sentence
+    has_number = None  # for the current sentence, computed on demand
+    for m in _SENTENCE_BREAK_OR_WORDS.finditer(text):
+        if m.group() in ".!?":
+            start = m.end()
+            has_number = None
+            continue
+        # a whole-word keyword is any run of up to _CARD_KEYWORD_MAX_PARTS
+        # consecutive parts of the hyphen-joined words ("precision-recall" also
+        # holds "precision" and "recall")
+        parts = m.group().split("-")
+        for i in range(len(parts)):
+            for j in range(i + 1, min(i + _CARD_KEYWORD_MAX_PARTS, len(parts)) + 1):
+                kw = "-".join(parts[i:j])
+                if kw in _CARD_KEYWORDS and kw not in counted:
+                    counted.add(kw)
+                    if has_number is None:
+                        stop = _SENTENCE_BREAK.search(text, start)
+                        end = stop.start() if stop else len(text)
+                        has_number = _NUMBER.search(text, start, end) is not None
+                    count += 2 if has_number else 1
+                    if count >= _CARD_SATURATION:
+                        return count
+    return count
+
+
 def _keyword_score(text: str, keywords: list[str]) -> float:
     """
     Function to count keywords in a string and compute score.
@@ -3,15 +3,17 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import os
 import re
 import time
 import json
 import shutil
-import tempfile
 from pathlib import Path
 from typing import Tuple, List, Optional
 
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -20,9 +22,20 @@ from git import Repo
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
+from .scratch import make_clone_dir
+
+try:
+    from ..utils.cache import memoized
+except ImportError:  # run as a script: src/scorer is on sys.path, not a package
+    from utils.cache import memoized
+
 # Load .env if present so GEN_AI_STUDIO_API_KEY / GENAI_* vars are picked up
 load_dotenv()
 
+# an LLM score only depends on the prompt text, so it can outlive the
+# per-URL results by far
+_LLM_CACHE_TTL = 30 * 86_400
+
 
 def _to_clone_url(url: str, url_type: str) -> str:
     p = urlparse(url)
@@ -73,18 +86,70 @@ SKIP_DIRS = {
 }
 
 
-def _read_first_readme(repo_dir: str) -> str:
+# blob-less and without a checkout: only commit + tree objects come down, so
+# the file list is free and the README is the only blob fetched
+_CLONE_OPTIONS = ["--depth=1", "--filter=blob:none", "--no-checkout"]
+
+
+def _git_paths(repo_dir: str, *pathspec: str) -> Optional[List[str]]:
+    """
+    Tracked paths at HEAD (limited to pathspec if given), or None when repo_dir
+    is not a git checkout.
+    """
+    if not (Path(repo_dir) / ".git").exists():
+        return None
+    try:
+        out = Repo(repo_dir).git.ls_tree(
+            "-r", "-z", "--name-only", "HEAD", "--", *pathspec
+        )
+    except Exception:
+        return None
+    # -z: names come through unquoted, even with non-ASCII characters
+    return [rel for rel in out.split("\0") if rel]
+
+
+def _checkout_readme(repo_dir: str, env: Optional[dict] = None) -> None:
+    """
+    Check out just the README candidates present in a _CLONE_OPTIONS clone.
+    """
+    present = _git_paths(repo_dir, *README_CANDIDATES)
+    if present:
+        Repo(repo_dir).git.checkout("HEAD", "--", *present, env=env)
+
+
+def _read_first_readme(repo_dir: str, max_bytes: Optional[int] = None) -> str:
     for rel in README_CANDIDATES:
         p = Path(repo_dir) / rel
         if p.exists() and p.is_file():
             try:
-                return p.read_text(encoding="utf-8", errors="ignore")
+                with open(p, "rb") as fh:
+                    return fh.read(max_bytes or -1).decode("utf-8", errors="ignore")
             except Exception:
                 pass
     return ""
 
 
+def _walk_key(rel: str) -> str:
+    """
+    Sort key putting paths in sorted-os.walk order (a directory's files before
+    its subdirectories). Built as one string, with \\0/\\1 marking files/dirs,
+    since comparing tuples of path parts is several times slower on big trees.
+    """
+    head, _, name = rel.rpartition("/")
+    if not head:
+        return "\0" + name
+    return "\1" + head.replace("/", "\0\1") + "\0\0" + name
+
+
 def _top_level_summary(repo_dir: str, max_files: int = 120) -> str:
+    tracked = _git_paths(repo_dir)
+    if tracked is not None:
+        # the clone has no working tree, so list the files from HEAD instead;
+        # only the first max_files are needed, so skip sorting the whole tree
+        kept = (
+            rel for rel in tracked if not SKIP_DIRS.intersection(rel.split("/")[:-1])
+        )
+        return "\n".join(heapq.nsmallest(max_files, kept, key=_walk_key))
     entries: List[str] = []
     root = Path(repo_dir)
     count = 0
@@ -120,6 +185,11 @@ USER_PROMPT_TEMPLATE = (
     "README (truncated if very long)\n----------------\n{readme}\n"
 )
 
+_STRICT_REASK_PROMPT = (
+    "Output EXACTLY this JSON (no analysis, no extra keys, no markdown): "
+    '{"score": <float 0..1>, "rationale": "<=200 chars>"}'
+)
+
 _HEUR_PATTERNS = [
     r"\bpip install\b",
     r"\bconda (?:create|install)\b",
@@ -137,10 +207,33 @@ _HEUR_PATTERNS = [
     r"\btutorial\b",
 ]
 
+# searched one by one: a single alternation would let one pattern's match
+# (e.g. "python example.py") hide another's ("example") and change the score
+_HEUR_RES = [re.compile(pat, re.IGNORECASE) for pat in _HEUR_PATTERNS]
+
+# DeepSeek R1 thinking, code fences, and a bare score to salvage
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_SCORE_RE = re.compile(r"\b(0(?:\.\d+)?|1(?:\.0+)?)\b")
+
+
+# with $SCORER_RAMPUP_FAST_PATH=1, heuristic scores at or outside these bounds
+# (no pattern hit, or 13+ of the 14) are used without asking the LLM
+_FAST_LOW = 0.15
+_FAST_HIGH = 0.90
+
+
+def _fast_path_enabled() -> bool:
+    return os.environ.get("SCORER_RAMPUP_FAST_PATH", "0").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
 
 def _heuristic_rampup(readme: str, tree: str) -> float:
     txt = (readme or "") + "\n" + (tree or "")
-    hits = sum(1 for pat in _HEUR_PATTERNS if re.search(pat, txt, flags=re.IGNORECASE))
+    hits = sum(1 for rx in _HEUR_RES if rx.search(txt))
     return max(0.0, min(1.0, 0.15 + 0.06 * hits))
 
 
@@ -154,196 +247,174 @@ def _session_with_retry() -> requests.Session:
         status_forcelist=(429, 500, 502, 503, 504),
         allowed_methods=frozenset(["POST"]),
     )
-    s.mount("https://", HTTPAdapter(max_retries=r))
-    s.mount("http://", HTTPAdapter(max_retries=r))
+    # sized for the CLI thread pool, which scores many repos at once
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=r)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     return s
 
 
+# one keep-alive session for every LLM call, so only the first pays the TCP/TLS
+# handshake to the GenAI endpoint
+_SESSION = _session_with_retry()
+
+
+_JSON = json.JSONDecoder()
+
+
 def _extract_json_first(s: str) -> dict | None:
+    """
+    First JSON object embedded in s, or None. Each "{" is handed to the C
+    decoder in turn, so prose around the object (even with stray quotes or an
+    unbalanced brace before it) does not get in the way.
+    """
     if not s:
         return None
-    depth = 0
-    start = -1
-    in_str = False
-    esc = False
-    quote = ""
-    for i, ch in enumerate(s):
-        if in_str:
-            if esc:
-                esc = False
-            elif ch == "\\":
-                esc = True
-            elif ch == quote:
-                in_str = False
-            continue
-        if ch == '"' or ch == "'":
-            in_str = True
-            quote = ch
-        elif ch == "{":
-            if depth == 0:
-                start = i
-            depth += 1
-        elif ch == "}":
-            if depth > 0:
-                depth -= 1
-                if depth == 0 and start != -1:
-                    snippet = s[start : i + 1]
-                    try:
-                        return json.loads(snippet)
-                    except Exception:
-                        start = -1
-                        continue
+    i = s.find("{")
+    while i != -1:
+        try:
+            obj, _ = _JSON.raw_decode(s, i)
+        except ValueError:
+            pass
+        else:
+            if isinstance(obj, dict):
+                return obj
+        i = s.find("{", i + 1)
     return None
 
 
-def _ask_llm(readme: str, tree: str) -> Optional[float]:
-    api_key = os.getenv("GEN_AI_STUDIO_API_KEY", "").strip()
-    if not api_key:
-        return None
-
-    base = os.getenv("GENAI_BASE_URL", "https://genai.rcac.purdue.edu").rstrip("/")
-    path = os.getenv("GENAI_PATH", "/api/chat/completions")
-    url = f"{base}{path}"
-    model = os.getenv("GENAI_MODEL", "").strip() or "deepseek-r1:7b"
-
-    def _build_payload(user_prompt: str):
-        return {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            "max_tokens": 220,
-            "temperature": 0.0,
-            "top_p": 1.0,
-            "response_format": {"type": "json_object"},
-        }
-
-    def _clean_text(txt: str) -> str:
-        if not txt:
-            return ""
-        # strip DeepSeek R1 thinking + code fences + leading/trailing junk
-        txt = re.sub(r"<think>.*?</think>", "", txt, flags=re.DOTALL)
-        txt = re.sub(r"^```(?:json)?\s*|\s*```$", "", txt.strip(), flags=re.IGNORECASE)
-        return txt.strip()
-
-    def _parse_or_salvage(txt: str) -> Optional[float]:
-        txt = _clean_text(txt)
-        parsed = _extract_json_first(txt)
-        if parsed and isinstance(parsed, dict) and "score" in parsed:
-            try:
-                return float(parsed["score"])
-            except Exception:
-                pass
-        # salvage: look for a number in [0,1] and use that
-        m = re.search(r"\b(0(?:\.\d+)?|1(?:\.0+)?)\b", txt)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                return None
-        return None
+def _llm_model() -> str:
+    return os.getenv("GENAI_MODEL", "").strip() or "deepseek-r1:7b"
+
+
+def _build_payload(model: str, user_prompt: str) -> dict:
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        "max_tokens": 220,
+        "temperature": 0.0,
+        "top_p": 1.0,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _clean_text(txt: str) -> str:
+    if not txt:
+        return ""
+    # strip DeepSeek R1 thinking + code fences + leading/trailing junk
+    txt = _THINK_RE.sub("", txt)
+    txt = _FENCE_RE.sub("", txt.strip())
+    return txt.strip()
+
+
+def _parse_or_salvage(txt: str) -> Optional[float]:
+    txt = _clean_text(txt)
+    parsed = _extract_json_first(txt)
+    if parsed and isinstance(parsed, dict) and "score" in parsed:
+        try:
+            return float(parsed["score"])
+        except Exception:
+            pass
+    # salvage: look for a number in [0,1] and use that
+    m = _SCORE_RE.search(txt)
+    if m:
+        try:
+            return float(m.group(1))
+        except Exception:
+            return None
+    return None
 
-    # Build the README+tree prompt
-    readme = (readme or "").strip()
-    if len(readme) > 20000:
-        readme = readme[:20000] + "\n\n[TRUNCATED]"
-    user_prompt_1 = (
-        USER_PROMPT_TEMPLATE.format(n_files=120, tree=tree[:8000], readme=readme)
-        + '\n\nReturn ONLY strict JSON: \
-        {"score": <float 0..1>, "rationale": "<=200 chars"}.'
-    )
 
-    # Preflight debug
-    payload = _build_payload(user_prompt_1)
-    payload_str = json.dumps(payload)
-    # Send with retries
-    session = _session_with_retry()
+def _chat(url: str, api_key: str, payload: dict, timeout: int) -> Optional[str]:
+    """
+    POST one chat completion and return the reply text ("" if it has none), or
+    None when the request or its HTTP status failed.
+    """
     try:
-        resp = session.post(
+        resp = _SESSION.post(
             url,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
-            data=payload_str,
-            timeout=90,
+            # bytes, sent as-is: UTF-8 and compact, unlike json.dumps
+            data=orjson.dumps(payload),
+            timeout=timeout,
         )
-    except requests.exceptions.Timeout:
-        return None
-    except requests.exceptions.SSLError:
-        return None
-    except requests.exceptions.ConnectionError:
-        return None
     except Exception:
+        # timeouts, TLS and connection errors alike
         return None
-
-    # HTTP status handling
-    if resp.status_code in (401, 402, 403):
-        return None
-    if resp.status_code == 400 and "Model not found" in (resp.text or ""):
-        return None
+    # 401/402/403 (auth/quota), 400 "Model not found", ...
     if resp.status_code != 200:
         return None
-
-    # Parse 1st pass
     try:
         data = resp.json()
-    except ValueError:
-        return None
-
-    txt = None
-    try:
-        txt = data["choices"][0]["message"]["content"]
     except Exception:
-        txt = data.get("output_text") or data.get("text") or ""
-    score = _parse_or_salvage(txt)
-    if isinstance(score, float):
-        return max(0.0, min(1.0, score))
-
-    # Second pass: ultra-strict re-ask (short, no repo text again)
-    user_prompt_2 = (
-        "Output EXACTLY this JSON (no analysis, no extra keys, no markdown): "
-        '{"score": <float 0..1>, "rationale": "<=200 chars>"}'
-    )
-    payload2 = _build_payload(user_prompt_2)
+        return None
     try:
-        resp2 = session.post(
-            url,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            data=json.dumps(payload2),
-            timeout=60,
-        )
+        return data["choices"][0]["message"]["content"]
     except Exception:
-        return None
+        return data.get("output_text") or data.get("text") or ""
 
-    if resp2.status_code != 200:
-        return None
 
-    try:
-        data2 = resp2.json()
-    except Exception:
+def _ask_llm(readme: str, tree: str) -> Optional[float]:
+    api_key = os.getenv("GEN_AI_STUDIO_API_KEY", "").strip()
+    if not api_key:
         return None
 
-    txt2 = None
-    try:
-        txt2 = data2["choices"][0]["message"]["content"]
-    except Exception:
-        txt2 = data2.get("output_text") or data2.get("text") or ""
+    base = os.getenv("GENAI_BASE_URL", "https://genai.rcac.purdue.edu").rstrip("/")
+    path = os.getenv("GENAI_PATH", "/api/chat/completions")
+    url = f"{base}{path}"
+    model = _llm_model()
 
-    score2 = _parse_or_salvage(txt2)
-    if isinstance(score2, float):
-        return max(0.0, min(1.0, score2))
+    # Build the README+tree prompt
+    readme = (readme or "").strip()
+    if len(readme) > 20000:
+        readme = readme[:20000] + "\n\n[TRUNCATED]"
+    user_prompt_1 = (
+        USER_PROMPT_TEMPLATE.format(n_files=120, tree=tree[:8000], readme=readme)
+        + '\n\nReturn ONLY strict JSON: \
+        {"score": <float 0..1>, "rationale": "<=200 chars"}.'
+    )
 
+    # First pass, then an ultra-strict re-ask (short, no repo text again) if
+    # the reply had no usable score
+    for user_prompt, timeout in (
+        (user_prompt_1, 90),
+        (_STRICT_REASK_PROMPT, 60),
+    ):
+        txt = _chat(url, api_key, _build_payload(model, user_prompt), timeout)
+        if txt is None:
+            return None
+        score = _parse_or_salvage(txt)
+        if isinstance(score, float):
+            return max(0.0, min(1.0, score))
     return None
 
 
-def get_ramp_up(url: str, url_type: str) -> Tuple[float, int]:
+def _llm_score(readme: str, tree: str) -> Optional[float]:
+    """
+    _ask_llm memoized on a hash of the README and file listing, so a repo whose
+    README and files are unchanged (a new commit, or another URL for the same
+    repo) is not sent to the LLM again. Failed asks (None) are not cached.
+    """
+    digest = hashlib.sha256(
+        (readme or "").encode("utf-8") + b"\0" + (tree or "").encode("utf-8")
+    ).hexdigest()
+    return memoized(
+        "ramp_up_llm",
+        (_llm_model(), digest),
+        lambda: _ask_llm(readme, tree),
+        ttl=_LLM_CACHE_TTL,
+    )
+
+
+def get_ramp_up(url: str, url_type: str) -> Tuple[Optional[float], int]:
     start = time.time()
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = make_clone_dir()
     try:
         kind = (
             "dataset"
@@ -353,18 +424,25 @@ def get_ramp_up(url: str, url_type: str) -> Tuple[float, int]:
         clone_url = _to_clone_url(url, kind)
         env = os.environ.copy()
         env.setdefault("GIT_LFS_SKIP_SMUDGE", "1")
-        Repo.clone_from(clone_url, temp_dir, multi_options=["--depth=100"], env=env)
+        Repo.clone_from(clone_url, temp_dir, multi_options=_CLONE_OPTIONS, env=env)
+        _checkout_readme(temp_dir, env)
 
         readme = _read_first_readme(temp_dir)
         tree = _top_level_summary(temp_dir, max_files=120)
 
-        score = _ask_llm(readme, tree)
-        if score is None:
-            score = _heuristic_rampup(readme, tree)
+        heuristic = _heuristic_rampup(readme, tree)
+        if _fast_path_enabled() and not _FAST_LOW < heuristic < _FAST_HIGH:
+            # the README is clearly good or clearly bare; skip the LLM
+            score = heuristic
+        else:
+            score = _llm_score(readme, tree)
+            if score is None:
+                score = heuristic
 
         latency_ms = int((time.time() - start) * 1000)
         return max(0.0, min(1.0, float(score))), latency_ms
     except Exception:
-        return 0.0, int((time.time() - start) * 1000)
+        # None (not 0.0) so a failed clone or LLM call is not cached
+        return None, int((time.time() - start) * 1000)
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,42 @@
+"""
+Scratch directories for throwaway git clones.
+Respects:
+  - $SCORER_SCRATCH (parent directory for clone dirs; default: /dev/shm when it
+    is a usable tmpfs with room to spare, else the system temp dir)
+"""
+
+import os
+import tempfile
+
+_SHM = "/dev/shm"
+# only use tmpfs when it has this much free space (container defaults are 64MB)
+_SHM_MIN_FREE = 512 * 1024 * 1024
+
+
+def _shm_free() -> int:
+    try:
+        if not os.access(_SHM, os.W_OK):
+            return 0
+        st = os.statvfs(_SHM)
+    except (AttributeError, OSError):
+        return 0
+    return st.f_bavail * st.f_frsize
+
+
+def _base_dir(min_free: int) -> str:
+    env = os.environ.get("SCORER_SCRATCH")
+    if env:
+        os.makedirs(env, exist_ok=True)
+        return env
+    # checked per clone: concurrent clones share the same tmpfs
+    if _shm_free() >= min_free:
+        return _SHM
+    return tempfile.gettempdir()
+
+
+def make_clone_dir(min_free: int = _SHM_MIN_FREE) -> str:
+    """
+    Fresh empty directory to clone into; the caller removes it when done. It is
+    placed on tmpfs only while that has at least min_free bytes available.
+    """
+    return tempfile.mkdtemp(prefix="scorer-", dir=_base_dir(min_free))
@@ -0,0 +1,154 @@
+"""
+Shared HTTP clients for the metrics.
+One pooled keep-alive requests.Session for GitHub REST calls and one HfApi
+instance, so concurrent metric calls reuse TCP/TLS connections instead of
+opening a new one per request. GitHub GETs made through github_get are
+revalidated by ETag against the on-disk cache, and hf_info shares one HF repo
+info fetch between all the metrics scoring the same repo.
+"""
+
+import base64
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+from huggingface_hub import HfApi, login
+
+import logging
+
+try:
+    from ..utils import cache
+except ImportError:  # run as a script: src/scorer is on sys.path, not a package
+    from utils import cache
+
+logging.getLogger("huggingface_hub").setLevel(logging.ERROR)
+
+# seconds; (connect, read)
+DEFAULT_TIMEOUT = (5, 30)
+# a cached body is only served after GitHub confirms it unchanged, so it can be
+# kept far longer than the per-URL results
+_ETAG_TTL = 30 * 86_400
+
+
+def _make_session() -> requests.Session:
+    s = requests.Session()
+    r = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+    )
+    # sized for the CLI thread pool (up to 32 workers)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=r)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def github_headers(**extra: str) -> dict:
+    """
+    Headers for a GitHub REST call; authenticated when $GITHUB_TOKEN is set
+    (5000 requests/hour instead of 60).
+    """
+    headers = {"X-GitHub-Api-Version": "2022-11-28", **extra}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def github_get(url: str, **extra_headers: str) -> requests.Response:
+    """
+    GET a GitHub REST URL with github_headers(), sending the ETag of the last 200
+    seen for it. A 304 (free against the rate limit) comes back as that cached
+    200, so callers handle both the same way.
+    """
+    headers = github_headers(**extra_headers)
+    key = cache.make_key("github_etag", (url, headers.get("Accept", "")))
+    hit = cache.get(key) if cache.cache_enabled() else None
+    if isinstance(hit, dict):
+        headers["If-None-Match"] = hit["etag"]
+    resp = SESSION.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    if resp.status_code == 304 and isinstance(hit, dict):
+        resp.status_code = 200
+        resp._content = base64.b64decode(hit["body"])
+    elif resp.status_code == 200 and cache.cache_enabled():
+        etag = resp.headers.get("ETag")
+        if isinstance(etag, str):
+            body = base64.b64encode(resp.content).decode("ascii")
+            cache.put(key, {"etag": etag, "body": body}, ttl=_ETAG_TTL)
+    return resp
+
+
+SESSION = _make_session()
+HF_API = HfApi()
+
+
+# once per process: login() verifies the token over the network
+@lru_cache(maxsize=1)
+def ensure_hf_login() -> None:
+    """
+    Log in non-interactively only if a token is present.
+    Never prompt, never run at import time.
+    """
+    token = (
+        os.getenv("HF_TOKEN")  # preferred
+        or os.getenv("HF_Token")  # be forgiving if someone used this
+        or os.getenv("HUGGINGFACE_TOKEN")  # extra alias, optional
+    )
+    if not token:
+        return
+    try:
+        # No interactive questions, no new session popups
+        login(
+            token=token,
+            add_to_git_credential=False,
+            write_permission=False,
+            new_session=False,
+        )
+    except Exception:
+        # Swallow login issues; callers should still work anonymously where possible
+        pass
+
+
+# (kind, repo_id) -> Future of its info; the most recent _HF_INFO_MAX are kept
+_HF_INFO_MAX = 256
+_hf_info_lock = threading.Lock()
+_hf_infos: Dict[Tuple[str, str], Future] = {}
+
+
+def hf_info(kind: str, repo_id: str) -> Any:
+    """
+    model_info/dataset_info (with file sizes) for an HF repo. The metrics for a
+    URL run concurrently and mostly need the same info, so the first caller
+    fetches it and the others wait for that result. Errors are raised to every
+    waiting caller and not kept.
+    """
+    key = (kind, repo_id)
+    with _hf_info_lock:
+        fut = _hf_infos.get(key)
+        owner = fut is None
+        if owner:
+            fut = _hf_infos[key] = Future()
+            if len(_hf_infos) > _HF_INFO_MAX:
+                _hf_infos.pop(next(iter(_hf_infos)))
+    if owner:
+        fetch = HF_API.dataset_info if kind == "dataset" else HF_API.model_info
+        try:
+            fut.set_result(fetch(repo_id=repo_id, files_metadata=True))
+        except BaseException as e:
+            with _hf_info_lock:
+                if _hf_infos.get(key) is fut:
+                    del _hf_infos[key]
+            fut.set_exception(e)
+    return fut.result()
+
+
+def clear_hf_info() -> None:
+    with _hf_info_lock:
+        _hf_infos.clear()
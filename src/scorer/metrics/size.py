@@ -1,22 +1,19 @@
 # --- size.py (refined) -------------------------------------------------------
-import os
 import re
 import time
 from typing import Tuple, Dict, Optional, List, DefaultDict
 from collections import defaultdict
 
-import requests
-from huggingface_hub import HfApi, login
 from dotenv import load_dotenv
 
 from .base import get_repo_id
+from .session import ensure_hf_login, github_get, hf_info
 
 import logging as _logging
 
 _logging.getLogger("huggingface_hub").setLevel(_logging.ERROR)
 
 load_dotenv()
-HF_API = HfApi()
 
 HARDWARE_LIMITS = {
     "raspberry_pi": 4_000_000_000,  # 4 GB
@@ -125,37 +122,22 @@ def _pick_min_viable_family(files: List[tuple]) -> int:
     return int(best_total or 0)
 
 
-def _maybe_login() -> None:
-    token = (
-        os.getenv("HF_TOKEN") or os.getenv("HF_Token") or os.getenv("HUGGINGFACE_TOKEN")
-    )
-    if not token:
-        return
-    try:
-        login(
-            token=token,
-            add_to_git_credential=False,
-            write_permission=False,
-            new_session=False,
-        )
-    except Exception:
-        pass
-
-
 def _hf_total_weight_bytes_model(repo_id: str) -> int:
-    info = HF_API.model_info(repo_id=repo_id, files_metadata=True)
+    info = hf_info("model", repo_id)
     files = [(s.rfilename or "", int(s.size or 0)) for s in info.siblings]
     return _pick_min_viable_family(files)
 
 
 def _hf_total_weight_bytes_dataset(repo_id: str) -> int:
-    info = HF_API.dataset_info(repo_id=repo_id, files_metadata=True)
+    info = hf_info("dataset", repo_id)
     return sum(int(s.size or 0) for s in info.siblings)
 
 
 def _github_repo_bytes(repo_id: str) -> int:
     base_url = f"https://api.github.com/repos/{repo_id}"
-    code_info = requests.get(base_url).json()
+    resp = github_get(base_url)
+    resp.raise_for_status()  # e.g. rate limited: no size to score
+    code_info = resp.json()
     return int(code_info.get("size", 0) or 0) * 1024
 
 
@@ -180,7 +162,7 @@ def _score_on_hardware(total_bytes: int, hw_key: str) -> float:
 
 
 def get_size_score(url: str, url_type: str) -> Tuple[Optional[Dict[str, float]], int]:
-    _maybe_login()
+    ensure_hf_login()
     t0 = time.time()
     try:
         repo_id = get_repo_id(url, url_type)
@@ -198,8 +180,9 @@ def get_size_score(url: str, url_type: str) -> Tuple[Optional[Dict[str, float]],
         else:
             total_bytes = 0
     except Exception as e:
+        # not 0 bytes (which would fit every device): report that it failed
         print(f"Error fetching artifact size: {e}")
-        total_bytes = 0
+        return None, int((time.time() - t0) * 1000)
 
     scores = {hw: _score_on_hardware(total_bytes, hw) for hw in HARDWARE_LIMITS}
     latency = int((time.time() - t0) * 1000)
@@ -1,7 +1,7 @@
 # src/scorer/url_handler/base.py (or wherever classify_url lives)
 
+from functools import lru_cache
 from urllib.parse import urlparse
-import re
 
 # Common hosts (lowercase, no scheme)
 _CODE_HOSTS = (
@@ -44,11 +44,26 @@ _MODEL_HOSTS = (
     "modelscope.cn",      # Alibaba ModelScope
 )
 
+# Host tables as sets so a lookup is one hash per domain label, not a scan
+_CODE_HOST_SET = frozenset(_CODE_HOSTS)
+_DATASET_HOST_SET = frozenset(_DATASET_HOSTS)
+_STORAGE_HOST_SET = frozenset(_STORAGE_HOSTS)
+_MODEL_HOST_SET = frozenset(_MODEL_HOSTS)
+
 # Fast helpers
 def _endswith_any(s: str, suffixes: tuple[str, ...]) -> bool:
-    s = s.lower()
-    return any(s.endswith(sfx) for sfx in suffixes)
-
+    # str.endswith takes a tuple and does the scan in C
+    return s.lower().endswith(suffixes)
+
+def _host_in(host: str, hosts: frozenset[str]) -> bool:
+    """True if host is in hosts or a subdomain of one (bucket.s3.amazonaws.com)."""
+    while host:
+        if host in hosts:
+            return True
+        host = host.partition(".")[2]
+    return False
+
+@lru_cache(maxsize=4096)
 def classify_url(url: str) -> str:
     """
     Classify URL as "code", "dataset", "model", or "unknown".
@@ -79,7 +94,7 @@ def classify_url(url: str) -> str:
     path_l = path.lower()
 
     # 1) Clear code hosts
-    if any(host == h or host.endswith("." + h) for h in _CODE_HOSTS):
+    if _host_in(host, _CODE_HOST_SET):
         return "code"
 
     # 2) Hugging Face: /datasets => dataset; otherwise => model
@@ -93,15 +108,15 @@ def classify_url(url: str) -> str:
         return "model"
 
     # 3) Other model hosts
-    if any(host == h or host.endswith("." + h) for h in _MODEL_HOSTS):
+    if _host_in(host, _MODEL_HOST_SET):
         return "model"
 
     # 4) Known dataset hosts
-    if any(host == h or host.endswith("." + h) for h in _DATASET_HOSTS):
+    if _host_in(host, _DATASET_HOST_SET):
         return "dataset"
 
     # 5) Storage/CDN or data-like file endings
-    if any(host == h or host.endswith("." + h) for h in _STORAGE_HOSTS):
+    if _host_in(host, _STORAGE_HOST_SET):
         return "dataset"
     if _endswith_any(path_l, _DATA_EXTS):
         return "dataset"
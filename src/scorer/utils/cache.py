@@ -0,0 +1,204 @@
+"""
+Persistent memoization for per-URL results, shared across runs.
+Respects:
+  - $SCORER_CACHE_DIR (directory for the cache db; default: ~/.cache/scorer)
+  - $SCORER_CACHE_TTL (entry lifetime in seconds; default: 86400)
+  - $SCORER_NO_CACHE  (1 = bypass the cache entirely)
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_TTL = 86_400  # 24h, so stale HF/GitHub metadata rolls over daily
+_MEMORY_MAX = 2048
+
+_MISS = object()
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_id: Optional[tuple] = None
+_memory: Dict[str, Any] = {}
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("SCORER_NO_CACHE", "0").strip().lower() not in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+def _ttl(ttl: Optional[int]) -> int:
+    if ttl is not None:
+        return ttl
+    try:
+        return int(os.environ.get("SCORER_CACHE_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _db() -> sqlite3.Connection:
+    """
+    Open (once per process) the SQLite file backing the cache.
+    Caller must hold _lock.
+    """
+    global _conn, _conn_id
+    root = Path(os.environ.get("SCORER_CACHE_DIR", "~/.cache/scorer")).expanduser()
+    if _conn is None or _conn_id != (os.getpid(), root):
+        root.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(
+            str(root / "cache.sqlite3"), timeout=30, check_same_thread=False
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        _conn_id = (os.getpid(), root)
+        # entries are only ever replaced, never read past expiry: drop the stale
+        # ones so the file does not grow without bound across runs
+        _conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+        _conn.commit()
+    return _conn
+
+
+def make_key(namespace: str, parts: Iterable[Any]) -> str:
+    raw = ":".join([namespace, *map(str, parts)])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get(key: str) -> Any:
+    """
+    Return the cached value for key, or _MISS if absent/expired/unreadable.
+    """
+    with _lock:
+        if key in _memory:
+            return _memory[key]
+        try:
+            row = (
+                _db()
+                .execute("SELECT expires, value FROM cache WHERE key = ?", (key,))
+                .fetchone()
+            )
+        except (OSError, sqlite3.Error):
+            return _MISS
+        if row is None or row[0] < time.time():
+            return _MISS
+        try:
+            value = json.loads(row[1])
+        except ValueError:
+            return _MISS
+        _remember(key, value)
+        return value
+
+
+def put(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    with _lock:
+        _remember(key, value)
+        try:
+            conn = _db()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                (key, time.time() + _ttl(ttl), json.dumps(value)),
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            # caching is best-effort; never fail the metric because of it
+            pass
+
+
+def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Bulk lookup straight from disk for high-volume entries (e.g. one per source
+    file) that would otherwise flush the in-memory layer. Misses are omitted.
+    """
+    keys = list(keys)
+    found: Dict[str, Any] = {}
+    if not keys or not cache_enabled():
+        return found
+    now = time.time()
+    with _lock:
+        try:
+            conn = _db()
+            # stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = conn.execute(
+                    "SELECT key, expires, value FROM cache WHERE key IN (%s)"
+                    % ",".join("?" * len(chunk)),
+                    chunk,
+                ).fetchall()
+                for key, expires, value in rows:
+                    if expires >= now:
+                        try:
+                            found[key] = json.loads(value)
+                        except ValueError:
+                            pass
+        except (OSError, sqlite3.Error):
+            pass
+    return found
+
+
+def put_many(items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+    """
+    Store every item in one transaction, bypassing the in-memory layer.
+    """
+    if not items or not cache_enabled():
+        return
+    expires = time.time() + _ttl(ttl)
+    with _lock:
+        try:
+            conn = _db()
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                [(k, expires, json.dumps(v)) for k, v in items.items()],
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+
+
+def _remember(key: str, value: Any) -> None:
+    if len(_memory) >= _MEMORY_MAX:
+        _memory.pop(next(iter(_memory)))
+    _memory[key] = value
+
+
+def _cacheable(result: Any) -> bool:
+    # (None, latency) means the metric could not run (a fetch or clone failed);
+    # don't pin that for a day. Metrics that fail raise or return None, never 0.0
+    if isinstance(result, (tuple, list)) and result and result[0] is None:
+        return False
+    return result is not None
+
+
+def memoized(
+    namespace: str,
+    parts: Iterable[Any],
+    fn: Callable[[], Any],
+    ttl: Optional[int] = None,
+) -> Any:
+    """
+    Return fn() memoized under (namespace, *parts). JSON round-trips turn tuples
+    into lists, so callers should unpack rather than compare types.
+    """
+    if not cache_enabled():
+        return fn()
+    key = make_key(namespace, parts)
+    hit = get(key)
+    if hit is not _MISS:
+        return hit
+    result = fn()
+    if _cacheable(result):
+        put(key, result, ttl)
+    return result
+
+
+def clear_memory() -> None:
+    with _lock:
+        _memory.clear()
@@ -0,0 +1,20 @@
+import pytest
+from src.scorer.metrics import session
+from src.scorer.utils import cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_hf_info():
+    # HF repo info is shared per process; keep one test's mocks out of the next
+    session.clear_hf_info()
+    yield
+    session.clear_hf_info()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory, monkeypatch):
+    # results memoized by one test (or a previous run) must not leak into another
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    cache.clear_memory()
+    yield
+    cache.clear_memory()
@@ -1,3 +1,4 @@
+import subprocess
 import pytest
 from unittest.mock import patch, MagicMock
 from src.scorer.metrics.busfactor import (
@@ -6,6 +7,7 @@ from src.scorer.metrics.busfactor import (
     _compute_bus_factor,
     _authors_by_file,
     _doa,
+    _collect_doa_inputs,
     _hf_kind_and_repo_id,
     _normalize_github_clone,
     _resolve_code_repo_for_target,
@@ -43,15 +45,15 @@ def test_normalize_github_clone():
         _normalize_github_clone("https://github.com/owner")
 
 
-@patch("src.scorer.metrics.busfactor.HF")
-def test_resolve_code_repo_for_target_github(mock_hf):
+@patch("src.scorer.metrics.busfactor.hf_info")
+def test_resolve_code_repo_for_target_github(mock_hf_info):
     """Test GitHub URL resolution (should return normalized GitHub URL)."""
     url = "https://github.com/owner/repo"
     result = _resolve_code_repo_for_target(url, "code")
     assert result == "https://github.com/owner/repo.git"
 
 
-@patch("src.scorer.metrics.busfactor.HF")
+@patch("src.scorer.metrics.session.HF_API")
 def test_resolve_code_repo_for_target_hf_model_with_gh_link(mock_hf):
     """Test HF model URL with GitHub link in card data."""
     mock_info = MagicMock()
@@ -65,8 +67,9 @@ def test_resolve_code_repo_for_target_hf_model_with_gh_link(mock_hf):
     result = _resolve_code_repo_for_target(url, "model")
 
     assert result == "https://github.com/owner/code-repo.git"
+    # one shared info fetch (see session.hf_info), not a card-only one
     mock_hf.model_info.assert_called_once_with(
-        "google/bert-base-uncased", files_metadata=False
+        repo_id="google/bert-base-uncased", files_metadata=True
     )
 
 
@@ -81,7 +84,7 @@ def make_mock_repo(file_structure=None, authors=None):
     mock_commit.stats.files = file_structure or {"file1.py": {}}
     mock_repo.iter_commits.return_value = [mock_commit]
 
-    # Patch git log for _first_author_email
+    # Patch git log for _first_authors
     mock_repo.git.log.return_value = "example@example.com\n"
 
     return mock_repo
@@ -117,12 +120,12 @@ def test_get_bus_factor_no_files(mock_repo_class, mock_clone_from):
 
 @patch("src.scorer.metrics.busfactor.Repo.clone_from")
 def test_get_bus_factor_clone_exception(mock_clone_from):
-    """Simulate Repo clone raising an exception; should return 0 score."""
+    """Simulate Repo clone raising an exception; the score is None (not cached)."""
     mock_clone_from.side_effect = Exception("clone failed")
 
     url = "https://huggingface.co/invalid/repo"
     score, latency = get_bus_factor(url, "model")
-    assert score == 0.0
+    assert score is None
     assert isinstance(latency, int)
     mock_clone_from.assert_called_once()
 
@@ -176,6 +179,22 @@ def test_authors_by_file_and_doa_logic():
     assert authors_of_file["file1.py"]  # at least one author kept
 
 
+def test_collect_doa_inputs_parses_git_log():
+    mock_repo = MagicMock()
+    changed = (
+        "__C__a1@example.com\ta1\n\nf1.py\nweights.bin\n" "__C__\tA2\n\nf1.py\nf2.py\n"
+    )
+    added = "__C__a1@example.com\n\nf1.py\n__C__a2\n\nf2.py\n"
+    mock_repo.git.log.side_effect = [changed, added]
+
+    dl, total_by_file, contributors, creators = _collect_doa_inputs(mock_repo, 30)
+
+    assert dict(total_by_file) == {"f1.py": 2, "f2.py": 1}
+    assert dl["f1.py"] == {"a1@example.com": 1, "a2": 1}
+    assert contributors["f2.py"] == {"a2"}
+    assert creators == {"f1.py": "a1@example.com", "f2.py": "a2"}
+
+
 @patch("src.scorer.metrics.busfactor.Repo.clone_from")
 @patch("src.scorer.metrics.busfactor.Repo", autospec=True)
 def test_get_bus_factor_multiple_files_authors(mock_repo_class, mock_clone_from):
@@ -198,3 +217,32 @@ def test_get_bus_factor_multiple_files_authors(mock_repo_class, mock_clone_from)
     score, latency = get_bus_factor(url, "code")
     assert 0 <= score <= 1
     assert isinstance(latency, int)
+
+
+def test_collect_doa_inputs_credits_merge_commits(tmp_path):
+    """A --no-ff merge counts for the files it brings in, like Commit.stats."""
+    from git import Repo
+
+    def git(*args, who="a"):
+        subprocess.run(
+            ["git", "-c", f"user.name={who}", "-c", f"user.email={who}@x", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q", "-b", "main")
+    (tmp_path / "a.py").write_text("a = 1\n")
+    git("add", "a.py")
+    git("commit", "-q", "-m", "a")
+    git("checkout", "-q", "-b", "feature")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    git("add", "b.py")
+    git("commit", "-q", "-m", "b", who="b")
+    git("checkout", "-q", "main")
+    git("merge", "-q", "--no-ff", "-m", "merge", "feature", who="m")
+
+    _, total_by_file, contributors, _ = _collect_doa_inputs(Repo(tmp_path), 3650)
+
+    assert contributors["b.py"] == {"b@x", "m@x"}
+    assert total_by_file["b.py"] == 2
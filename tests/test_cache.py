@@ -0,0 +1,58 @@
+import sqlite3
+from unittest.mock import MagicMock
+from src.scorer.utils import cache
+
+
+def test_memoized_reuses_result_across_memory_and_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    fn = MagicMock(return_value=(0.5, 12))
+
+    first = cache.memoized("license", ("https://x", "model"), fn)
+    cache.clear_memory()
+    second = cache.memoized("license", ("https://x", "model"), fn)
+
+    assert first == (0.5, 12)
+    assert list(second) == [0.5, 12]
+    fn.assert_called_once()
+
+
+def test_memoized_skips_failed_results(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    fn = MagicMock(return_value=(None, 3))
+
+    cache.memoized("size", ("https://y", "model"), fn)
+    cache.memoized("size", ("https://y", "model"), fn)
+    assert fn.call_count == 2
+
+
+def test_memoized_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("SCORER_NO_CACHE", "1")
+    fn = MagicMock(return_value=(1.0, 5))
+
+    cache.memoized("ramp_up", ("https://z", "code"), fn)
+    cache.memoized("ramp_up", ("https://z", "code"), fn)
+    assert fn.call_count == 2
+
+
+def test_make_key_distinguishes_namespaces():
+    assert cache.make_key("a", ("u",)) != cache.make_key("b", ("u",))
+
+
+def test_expired_entries_are_swept_on_open(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    cache.put("stale", 1, ttl=-1)
+    cache.put("fresh", 2)
+
+    # a new cache dir forces a reopen, which sweeps the old file's stale rows
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path / "other"))
+    cache.get("x")
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    cache.get("x")
+
+    conn = sqlite3.connect(str(tmp_path / "cache.sqlite3"))
+    keys = {k for (k,) in conn.execute("SELECT key FROM cache")}
+    assert keys == {"fresh"}
@@ -3,11 +3,16 @@ Test code_quality.py
 """
 
 import os
+import subprocess
 import pytest
 from unittest.mock import patch
 from pathlib import Path
 
+from src.scorer.metrics import code_quality
+from src.scorer.utils.cache import memoized
 from src.scorer.metrics.code_quality import (
+    CloneBudgetExceeded,
+    _shallow_clone,
     get_code_quality,
     _check_code_repo_quality,
     run_radon,
@@ -29,20 +34,22 @@ def test_code_url(load_env):
     url_code = "https://github.com/google-research/bert"
     url_type_code = "code"
     score, latency = get_code_quality(url_code, url_type_code)
-    assert isinstance(score, float)
-    assert 0.0 <= score <= 1.0
     assert isinstance(latency, int)
     assert latency > 0
+    # None when the repo cannot be cloned (offline)
+    if score is not None:
+        assert isinstance(score, float)
+        assert 0.0 <= score <= 1.0
 
 
-@patch("src.scorer.metrics.code_quality.Repo.clone_from")
+@patch("src.scorer.metrics.code_quality._shallow_clone")
 @patch("src.scorer.metrics.code_quality.os.walk")
-@patch("src.scorer.metrics.code_quality.os.path.exists")
+@patch("src.scorer.metrics.code_quality.os.listdir")
 @patch("src.scorer.metrics.code_quality.run_radon")
 @patch("src.scorer.metrics.code_quality.run_lizard")
 @patch("src.scorer.metrics.code_quality.docstring_ratio")
 def test_check_code_repo_quality_all_branches(
-    mock_docstring, mock_lizard, mock_radon, mock_exists, mock_walk, mock_clone
+    mock_docstring, mock_lizard, mock_radon, mock_listdir, mock_walk, mock_clone
 ):
     # Mock repo clone does nothing
     mock_clone.return_value = None
@@ -53,13 +60,13 @@ def test_check_code_repo_quality_all_branches(
     ]
 
     # Simulate that .github exists and Dockerfile exists
-    def exists_side(path):
-        return any(
-            x in path
-            for x in [".github", "Dockerfile", "requirements.txt", "README.md"]
-        )
-
-    mock_exists.side_effect = exists_side
+    mock_listdir.return_value = [
+        ".github",
+        "Dockerfile",
+        "requirements.txt",
+        "README.md",
+        "setup.py",
+    ]
 
     # Radon score branch
     mock_radon.return_value = 0.8
@@ -73,6 +80,101 @@ def test_check_code_repo_quality_all_branches(
     assert 0.0 <= score <= 1.0
 
 
+@patch("src.scorer.metrics.code_quality._shallow_clone")
+@patch("src.scorer.metrics.code_quality.os.listdir", return_value=[])
+@patch("src.scorer.metrics.code_quality.run_radon", return_value=1.0)
+@patch("src.scorer.metrics.code_quality.run_lizard")
+def test_check_code_repo_quality_skips_lizard_after_perfect_radon(
+    mock_lizard, mock_radon, mock_listdir, mock_clone, tmp_path
+):
+    (tmp_path / "a.py").write_text("def foo():\n    pass\n")
+    with patch("src.scorer.metrics.code_quality.make_clone_dir") as mk:
+        mk.return_value = str(tmp_path)
+        score = _check_code_repo_quality("https://fake.repo")
+
+    mock_lizard.assert_not_called()
+    assert score >= 0.7
+
+
+@patch("src.scorer.metrics.code_quality._remote_head_sha", return_value="abc123")
+@patch("src.scorer.metrics.code_quality._check_code_repo_quality", return_value=0.75)
+def test_get_code_quality_reuses_score_for_same_commit(
+    mock_check, mock_sha, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+
+    first, _ = get_code_quality("https://github.com/a/b", "code")
+    second, _ = get_code_quality("https://github.com/a/b/tree/main", "code")
+
+    assert first == second == 0.75
+    mock_check.assert_called_once()
+
+
+@patch("src.scorer.metrics.code_quality._remote_head_sha", return_value="def456")
+@patch("src.scorer.metrics.code_quality._check_code_repo_quality", return_value=0.5)
+def test_get_code_quality_runs_once_per_url_without_disk_cache(
+    mock_check, mock_sha, monkeypatch
+):
+    monkeypatch.setenv("SCORER_NO_CACHE", "1")
+    code_quality._code_quality_score.cache_clear()
+
+    first, _ = get_code_quality("https://github.com/c/d", "code")
+    second, _ = get_code_quality("https://github.com/c/d", "code")
+
+    assert first == second == 0.5
+    mock_check.assert_called_once()
+    mock_sha.assert_called_once()
+
+
+@patch("src.scorer.metrics.code_quality._remote_head_sha", return_value="0ff")
+@patch(
+    "src.scorer.metrics.code_quality._check_code_repo_quality",
+    side_effect=CloneBudgetExceeded("too big"),
+)
+def test_get_code_quality_over_budget_is_not_cached(
+    mock_check, mock_sha, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    code_quality._code_quality_score.cache_clear()
+
+    url = "https://github.com/big/repo"
+    first = memoized(
+        "code_quality", (url, "code"), lambda: get_code_quality(url, "code")
+    )
+    memoized("code_quality", (url, "code"), lambda: get_code_quality(url, "code"))
+
+    assert first[0] is None
+    assert mock_check.call_count == 2
+
+
+def test_shallow_clone_aborts_over_size_budget(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    for args in (["init", "-q"], ["commit", "-q", "--allow-empty", "-m", "init"]):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=src,
+            check=True,
+        )
+    monkeypatch.setattr(code_quality, "_CLONE_MAX_BYTES", -1)
+    monkeypatch.setattr(code_quality, "_CLONE_POLL_S", 0.0)
+
+    with pytest.raises(CloneBudgetExceeded):
+        _shallow_clone(src.as_uri(), str(tmp_path / "dest"))
+
+
+def test_has_test_file_skips_vendored_dirs(tmp_path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "test.js").write_text("")
+    assert not code_quality._has_test_file(str(tmp_path))
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "test_app.py").write_text("")
+    assert code_quality._has_test_file(str(tmp_path))
+
+
 def test_score_from_lizard_totals_various():
     # CCN branches
     totals_list = [
@@ -95,17 +197,62 @@ def test_docstring_ratio(tmp_path):
     assert 0.0 <= score <= 1.0
 
 
-def test_run_radon_and_lizard(monkeypatch):
-    # Patch subprocess.run to simulate radon output
-    class Result:
-        stdout = "a.py - A\nb.py - B\n"
-        returncode = 0
+def test_docstring_ratio_without_defs(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    assert docstring_ratio(str(tmp_path)) == 0.0
 
-    monkeypatch.setattr("subprocess.run", lambda *a, **k: Result())
-    score = run_radon(".")
-    assert 0.0 <= score <= 1.0
 
-    # Lizard totals output
-    monkeypatch.setattr("subprocess.run", lambda *a, **k: Result())
-    totals = run_lizard(".")
-    assert totals is None or isinstance(totals, dict)
+def test_docstring_ratio_counts_nested_and_async_defs(tmp_path):
+    (tmp_path / "a.py").write_text(
+        "try:\n"
+        "    import x\n"
+        "except ImportError:\n"
+        "    def fallback():\n"
+        '        """doc"""\n'
+        "async def fetch():\n"
+        "    pass\n"
+        "class C:\n"
+        "    if True:\n"
+        "        def m(self):\n"
+        '            """doc"""\n'
+        "f = lambda: None\n"
+    )
+    assert docstring_ratio(str(tmp_path)) == 0.5
+
+
+def test_scan_python_reuses_per_file_results(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text('def foo():\n    """doc"""\n')
+    (repo / "b.py").write_text("class Bar:\n    pass\n")
+    first = code_quality._scan_python(str(repo))
+
+    with patch.object(code_quality, "_scan_file") as scan_file:
+        second = code_quality._scan_python(str(repo))
+
+    scan_file.assert_not_called()
+    assert second == first
+    assert (first.total_defs, first.documented_defs) == (2, 1)
+
+
+def test_docstring_ratio_ignores_vendored_and_hidden_dirs(tmp_path):
+    (tmp_path / "a.py").write_text('def foo():\n    """doc"""\n')
+    for vendored in ("venv", ".tox", "build"):
+        (tmp_path / vendored).mkdir()
+        (tmp_path / vendored / "b.py").write_text("def bar():\n    pass\n")
+    assert docstring_ratio(str(tmp_path)) == 1.0
+
+
+def test_run_radon_and_lizard(tmp_path):
+    (tmp_path / "a.py").write_text("def foo(x):\n    return x + 1\n")
+    (tmp_path / "b.py").write_text("def bar(:\n")  # unparsable, skipped
+
+    score = run_radon(str(tmp_path))
+    assert score == 1.0
+
+    totals = run_lizard(str(tmp_path))
+    assert isinstance(totals, dict)
+    assert totals["Function Count"] == 1
+    assert totals["Warning Count"] == 0
@@ -2,8 +2,8 @@ from unittest.mock import patch, MagicMock
 
 
 def test_dataset_and_code_score_model():
-    with patch("src.scorer.metrics.dataset_and_code.login") as mock_login, patch(
-        "src.scorer.metrics.dataset_and_code.HF_API"
+    with patch("src.scorer.metrics.session.login") as mock_login, patch(
+        "src.scorer.metrics.session.HF_API"
     ) as mock_hf_api_instance, patch(
         "src.scorer.metrics.dataset_and_code.get_repo_id", return_value="mock/repo"
     ):
@@ -37,9 +37,7 @@ def test_dataset_and_code_score_model():
 
 
 def test_dataset_type_repo():
-    with patch(
-        "src.scorer.metrics.dataset_and_code.HF_API"
-    ) as mock_hf_api_instance, patch(
+    with patch("src.scorer.metrics.session.HF_API") as mock_hf_api_instance, patch(
         "src.scorer.metrics.dataset_and_code.get_repo_id", return_value="mock/dataset"
     ):
 
@@ -60,9 +58,7 @@ def test_dataset_type_repo():
 
 
 def test_empty_readme_no_code():
-    with patch(
-        "src.scorer.metrics.dataset_and_code.HF_API"
-    ) as mock_hf_api_instance, patch(
+    with patch("src.scorer.metrics.session.HF_API") as mock_hf_api_instance, patch(
         "src.scorer.metrics.dataset_and_code.get_repo_id", return_value="mock/repo"
     ):
 
@@ -81,9 +77,7 @@ def test_empty_readme_no_code():
 
 
 def test_repo_info_fetch_exception():
-    with patch(
-        "src.scorer.metrics.dataset_and_code.HF_API"
-    ) as mock_hf_api_instance, patch(
+    with patch("src.scorer.metrics.session.HF_API") as mock_hf_api_instance, patch(
         "src.scorer.metrics.dataset_and_code.get_repo_id", return_value="mock/repo"
     ):
 
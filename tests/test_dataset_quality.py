@@ -1,7 +1,7 @@
 from pytest import approx
 import types
 from unittest.mock import patch
-from src.scorer.metrics import dataset_quality
+from src.scorer.metrics import dataset_quality, session
 
 
 def test_normalize_zero_and_negative():
@@ -18,7 +18,7 @@ def test_normalize_within_range():
 @patch("src.scorer.metrics.dataset_quality.get_repo_id", return_value="mock/repo")
 def test_get_dataset_quality_score_with_likes(mock_get_repo_id):
     fake_info = types.SimpleNamespace(downloads=50_000, likes=100)
-    with patch.object(dataset_quality.HF_API, "dataset_info", return_value=fake_info):
+    with patch.object(session.HF_API, "dataset_info", return_value=fake_info):
         score, latency = dataset_quality.get_dataset_quality_score(
             "fake_url", "dataset"
         )
@@ -31,7 +31,7 @@ def test_get_dataset_quality_score_with_likes(mock_get_repo_id):
 @patch("src.scorer.metrics.dataset_quality.get_repo_id", return_value="mock/repo")
 def test_get_dataset_quality_score_without_likes(mock_get_repo_id):
     fake_info = types.SimpleNamespace(downloads=10_000, likes=0)
-    with patch.object(dataset_quality.HF_API, "dataset_info", return_value=fake_info):
+    with patch.object(session.HF_API, "dataset_info", return_value=fake_info):
         score = dataset_quality.get_dataset_quality_score("fake_url", "dataset")
 
     # When likes = 0, function returns downloads_score only
@@ -1,5 +1,5 @@
 from unittest.mock import patch, MagicMock
-from src.scorer.metrics import license
+from src.scorer.metrics import license, session
 
 
 def test_is_compatible_valid_licenses():
@@ -19,7 +19,7 @@ def test_is_compatible_invalid_license():
 @patch("src.scorer.metrics.license.get_repo_id", return_value="mock/repo")
 def test_get_license_score_model(mock_get_repo_id):
     fake_info = MagicMock(license="mit")
-    with patch.object(license.HF_API, "model_info", return_value=fake_info):
+    with patch.object(session.HF_API, "model_info", return_value=fake_info):
         score, latency = license.get_license_score("fake_url", "model")
     assert score == 1
     assert isinstance(latency, int)
@@ -28,7 +28,7 @@ def test_get_license_score_model(mock_get_repo_id):
 @patch("src.scorer.metrics.license.get_repo_id", return_value="mock/repo")
 def test_get_license_score_dataset(mock_get_repo_id):
     fake_info = MagicMock(license="apache-2.0")
-    with patch.object(license.HF_API, "dataset_info", return_value=fake_info):
+    with patch.object(session.HF_API, "dataset_info", return_value=fake_info):
         score, latency = license.get_license_score("fake_url", "dataset")
     assert score == 1
     assert isinstance(latency, int)
@@ -38,8 +38,8 @@ def test_get_license_score_dataset(mock_get_repo_id):
 def test_get_license_score_code(mock_get_repo_id):
     fake_license_response = {"license": {"name": "MIT"}}
     with patch(
-        "src.scorer.metrics.license.requests.get",
-        return_value=MagicMock(json=lambda: fake_license_response),
+        "src.scorer.metrics.session.SESSION.get",
+        return_value=MagicMock(status_code=200, json=lambda: fake_license_response),
     ):
         score, latency = license.get_license_score("fake_url", "code")
     assert score == 1
@@ -49,7 +49,24 @@ def test_get_license_score_code(mock_get_repo_id):
 @patch("src.scorer.metrics.license.get_repo_id", return_value="mock/repo")
 def test_get_license_score_incompatible(mock_get_repo_id):
     fake_info = MagicMock(license="proprietary")
-    with patch.object(license.HF_API, "model_info", return_value=fake_info):
+    with patch.object(session.HF_API, "model_info", return_value=fake_info):
         score, latency = license.get_license_score("fake_url", "model")
     assert score == 0
     assert isinstance(latency, int)
+
+
+@patch("src.scorer.metrics.license.get_repo_id", return_value="mock/repo")
+def test_get_license_score_code_prefers_spdx_id(mock_get_repo_id):
+    repo = {
+        "license": {
+            "spdx_id": "LGPL-2.1",
+            "name": "GNU Lesser General Public License v2.1",
+        }
+    }
+    with patch(
+        "src.scorer.metrics.session.SESSION.get",
+        return_value=MagicMock(status_code=200, json=lambda: repo),
+    ) as get:
+        score, _ = license.get_license_score("fake_url", "code")
+    assert score == 1
+    assert get.call_args.args[0] == "https://api.github.com/repos/mock/repo"
@@ -6,6 +6,8 @@ import os
 import pytest
 from dotenv import load_dotenv
 from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.scorer.metrics import performance_claims, session
 from src.scorer.metrics.performance_claims import get_performance_claims
 
 # @pytest.fixture(scope = "session", autouse = True)
@@ -38,12 +40,14 @@ def test_model_url(load_env):
     url_type_model = "model"
     score, latency = get_performance_claims(url_model, url_type_model)
 
-    print(f"Model: Score = {score:.2f}, Latency ={latency}ms")
+    print(f"Model: Score = {score}, Latency = {latency}ms")
 
-    assert isinstance(score, (float))
     assert isinstance(latency, (int))
-    assert 0.0 <= score <= 1.0
     assert latency > 0
+    # None when the README cannot be fetched (offline, rate limited)
+    if score is not None:
+        assert isinstance(score, (float))
+        assert 0.0 <= score <= 1.0
 
 
 def test_code_url(load_env):
@@ -55,9 +59,93 @@ def test_code_url(load_env):
     url_type_code = "code"
     score, latency = get_performance_claims(url_code, url_type_code)
 
-    print(f"Code: Score = {score:.2f}, Latency = {latency}ms")
+    print(f"Code: Score = {score}, Latency = {latency}ms")
 
-    assert isinstance(score, (float))
     assert isinstance(latency, (int))
-    assert 0.0 <= score <= 1.0
     assert latency > 0
+    # None when the README cannot be fetched (offline, rate limited)
+    if score is not None:
+        assert isinstance(score, (float))
+        assert 0.0 <= score <= 1.0
+
+
+def test_code_repo_uses_github_api_without_cloning():
+    """
+    README and listing come from the contents API; no clone is made
+    """
+
+    listing = MagicMock(status_code=200)
+    listing.json.return_value = [{"name": "README.md"}, {"name": "eval.py"}]
+    readme = MagicMock(status_code=200, content=b"Benchmark results")
+    with patch.object(
+        session.SESSION, "get", side_effect=[listing, readme]
+    ) as get, patch.object(performance_claims.Repo, "clone_from") as clone:
+        score = performance_claims._check_code_repo_performance(
+            "https://github.com/pallets/flask"
+        )
+
+    assert score == 0.7
+    assert get.call_args_list[0].args[0].endswith("/repos/pallets/flask/contents/")
+    clone.assert_not_called()
+
+
+def test_code_repo_falls_back_to_clone_when_api_fails():
+    """
+    A rate-limited API call falls back to a shallow clone
+    """
+
+    with patch.object(
+        session.SESSION, "get", return_value=MagicMock(status_code=403)
+    ), patch.object(performance_claims, "_clone_readme_and_listing") as clone:
+        clone.return_value = ("", ["tests"])
+        score = performance_claims._check_code_repo_performance(
+            "https://github.com/pallets/flask"
+        )
+
+    assert score == 0.7
+    clone.assert_called_once()
+
+
+def test_code_repo_unreachable_is_none():
+    """
+    No README from the API or a clone is a failure (None), not a 0.0 score
+    """
+
+    with patch.object(
+        session.SESSION, "get", return_value=MagicMock(status_code=403)
+    ), patch.object(performance_claims, "_clone_readme_and_listing", return_value=None):
+        score = performance_claims._check_code_repo_performance(
+            "https://github.com/pallets/flask"
+        )
+
+    assert score is None
+
+
+def test_card_keyword_count_matches_whole_words_per_sentence():
+    """
+    Each keyword counts once, doubled when its first sentence has a number
+    """
+
+    text = "we report precision-recall. accuracy of 91.2% on imagenet! remapped"
+    # precision-recall, precision, recall: 1 each; accuracy: 2; "map" not a word
+    assert performance_claims._card_keyword_count(text) == 5
+
+
+def test_model_card_read_from_main_when_info_fetch_fails(tmp_path):
+    """
+    The commit pin is optional: a failed info fetch still scores the README
+    """
+
+    readme = tmp_path / "README.md"
+    readme.write_text("benchmark results: accuracy 90%")
+    with patch.object(
+        session.HF_API, "model_info", side_effect=OSError("rate limited")
+    ), patch.object(
+        performance_claims, "hf_hub_download", return_value=str(readme)
+    ) as download:
+        score = performance_claims._check_model_card_performance(
+            "https://huggingface.co/org/model"
+        )
+
+    assert score > 0.0
+    assert download.call_args.kwargs["revision"] is None
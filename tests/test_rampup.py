@@ -28,6 +28,11 @@ def test_extract_json_first_invalid_json():
     assert result is None
 
 
+def test_extract_json_first_after_stray_quote():
+    text = 'Here\'s my answer: {"score": 0.4, "rationale": "ok"}'
+    assert _extract_json_first(text) == {"score": 0.4, "rationale": "ok"}
+
+
 def test_extract_json_first_no_json():
     text = "hello world"
     result = _extract_json_first(text)
@@ -88,6 +93,18 @@ def test_read_first_readme_found(tmp_path):
     assert content == "Hello World"
 
 
+def test_read_first_readme_bounded(tmp_path):
+    (tmp_path / "README.md").write_text("x" * 100_000)
+    assert len(_read_first_readme(str(tmp_path), max_bytes=1000)) == 1000
+
+
+def test_read_first_readme_full_by_default(tmp_path):
+    (tmp_path / "README.md").write_text("x" * 100_000 + "\npip install pkg")
+    readme = _read_first_readme(str(tmp_path))
+    assert readme.endswith("pip install pkg")
+    assert _heuristic_rampup(readme, "") > _heuristic_rampup("x" * 100_000, "")
+
+
 def test_read_first_readme_missing(tmp_path):
     # No README files
     content = _read_first_readme(str(tmp_path))
@@ -143,6 +160,31 @@ def test_top_level_summary_empty_dir(tmp_path):
     assert result == ""
 
 
+def test_summary_and_readme_from_clone_without_checkout(tmp_path):
+    """Listing comes from HEAD; only the README is checked out."""
+    from git import Repo
+    from src.scorer.metrics.rampup import _checkout_readme
+
+    repo = Repo.init(tmp_path)
+    for rel in ["README.md", "setup.py", "pkg/mod.py", "node_modules/x.js"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("pip install pkg")
+    repo.index.add(["README.md", "setup.py", "pkg/mod.py", "node_modules/x.js"])
+    repo.index.commit("init")
+    for rel in ["README.md", "setup.py", "pkg/mod.py", "node_modules/x.js"]:
+        (tmp_path / rel).unlink()
+
+    assert _top_level_summary(str(tmp_path)).split("\n") == [
+        "README.md",
+        "setup.py",
+        "pkg/mod.py",
+    ]
+    _checkout_readme(str(tmp_path))
+    assert _read_first_readme(str(tmp_path)) == "pip install pkg"
+    assert not (tmp_path / "setup.py").exists()
+
+
 def test_heuristic_rampup_low_score():
     """Test heuristic with few patterns."""
     readme = "# Project\nThis is a project."
@@ -174,8 +216,9 @@ def test_ask_llm_no_env_vars():
         assert score is None
 
 
+@patch("src.scorer.metrics.rampup.Repo.clone_from")
 @patch("src.scorer.metrics.rampup._ask_llm", return_value=0.77)
-def test_ask_llm_json_and_regex(mock_ask_llm):
+def test_ask_llm_json_and_regex(mock_ask_llm, mock_clone_from):
     from src.scorer.metrics.rampup import get_ramp_up
 
     score, _ = get_ramp_up("https://huggingface.co/mock/repo", "model")
@@ -199,17 +242,17 @@ def create_dummy_repo_files(tmpdir, files=None, readme_content="Example README")
 @patch("src.scorer.metrics.rampup.Repo.clone_from")
 @patch("src.scorer.metrics.rampup._ask_llm")
 def test_get_ramp_up_clone_fail(mock_ask_llm, mock_clone_from):
-    """Simulate clone error; should return score 0."""
+    """Simulate clone error; the score is None (a failure, never cached)."""
     mock_clone_from.side_effect = Exception("clone failed")
     score, latency = get_ramp_up("https://huggingface.co/fake/repo", "model")
-    assert score == 0.0
+    assert score is None
     assert isinstance(latency, int)
 
 
 @patch("src.scorer.metrics.rampup.Repo.clone_from")
 @patch("src.scorer.metrics.rampup._ask_llm")
 def test_get_ramp_up_llm_fail(mock_ask_llm, mock_clone_from):
-    """Simulate LLM error; should return score 0."""
+    """Simulate LLM error; the score is None (a failure, never cached)."""
     mock_ask_llm.side_effect = Exception("LLM failure")
 
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -218,7 +261,7 @@ def test_get_ramp_up_llm_fail(mock_ask_llm, mock_clone_from):
 
         score, latency = get_ramp_up("https://huggingface.co/mock/repo", "model")
 
-    assert score == 0.0
+    assert score is None
     assert isinstance(latency, int)
 
 
@@ -242,7 +285,7 @@ def test_get_ramp_up_llm_exception(
     mock_clone_from.return_value = MagicMock()
 
     score, latency = get_ramp_up("https://huggingface.co/mock/repo", "model")
-    assert score == 0.0
+    assert score is None
     assert isinstance(latency, int)
 
     mock_clone_from.assert_called_once()
@@ -297,6 +340,49 @@ def test_get_ramp_up_llm_success(
     mock_ask_llm.assert_called_once()
 
 
+@patch("src.scorer.metrics.rampup.Repo.clone_from")
+@patch("src.scorer.metrics.rampup._ask_llm")
+@patch("src.scorer.metrics.rampup._read_first_readme")
+@patch("src.scorer.metrics.rampup._top_level_summary")
+def test_get_ramp_up_reuses_llm_score_for_same_content(
+    mock_summary, mock_readme, mock_ask_llm, mock_clone_from, monkeypatch
+):
+    """Unchanged README + file list is not sent to the LLM twice."""
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    mock_readme.return_value = "# Test README\npip install test"
+    mock_summary.return_value = "setup.py\nREADME.md"
+    mock_ask_llm.return_value = 0.7
+
+    first, _ = get_ramp_up("https://github.com/owner/repo", "code")
+    second, _ = get_ramp_up("https://github.com/owner/repo/tree/main", "code")
+
+    assert first == second == 0.7
+    mock_ask_llm.assert_called_once()
+
+
+@patch("src.scorer.metrics.rampup.Repo.clone_from")
+@patch("src.scorer.metrics.rampup._ask_llm")
+@patch("src.scorer.metrics.rampup._read_first_readme")
+@patch("src.scorer.metrics.rampup._top_level_summary")
+def test_get_ramp_up_fast_path_skips_llm_when_heuristic_is_clear(
+    mock_summary, mock_readme, mock_ask_llm, mock_clone_from, monkeypatch
+):
+    monkeypatch.setenv("SCORER_RAMPUP_FAST_PATH", "1")
+    mock_readme.return_value = ""
+    mock_summary.return_value = ""
+    mock_ask_llm.return_value = 0.6
+
+    score, _ = get_ramp_up("https://huggingface.co/mock/repo", "model")
+    assert score == 0.15
+    mock_ask_llm.assert_not_called()
+
+    # a middling heuristic still goes to the LLM
+    mock_readme.return_value = "# Usage\npip install x\nsee the docs"
+    score, _ = get_ramp_up("https://huggingface.co/mock/repo", "model")
+    assert score == 0.6
+    mock_ask_llm.assert_called_once()
+
+
 # Test score clamping
 @patch("src.scorer.metrics.rampup.Repo.clone_from")
 @patch("src.scorer.metrics.rampup._ask_llm")
@@ -315,7 +401,8 @@ def test_get_ramp_up_score_clamping(
     score, _ = get_ramp_up("https://huggingface.co/mock/repo", "model")
     assert score == 1.0
 
-    # Test score < 0.0 gets clamped
+    # Test score < 0.0 gets clamped (new README: LLM scores are cached per content)
+    mock_readme.return_value = "README v2"
     mock_ask_llm.return_value = -0.5
     score, _ = get_ramp_up("https://huggingface.co/mock/repo", "model")
     assert score == 0.0
@@ -0,0 +1,37 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.scorer.metrics import session
+from src.scorer.utils import cache
+
+
+def test_github_get_serves_cached_body_on_304(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCORER_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SCORER_NO_CACHE", raising=False)
+    cache.clear_memory()
+    url = "https://api.github.com/repos/mock/etag"
+    fresh = MagicMock(status_code=200, headers={"ETag": 'W/"abc"'}, content=b"{}")
+    not_modified = session.requests.Response()
+    not_modified.status_code = 304
+
+    with patch.object(session.SESSION, "get", side_effect=[fresh, not_modified]) as get:
+        session.github_get(url)
+        cache.clear_memory()
+        resp = session.github_get(url)
+
+    assert get.call_args_list[1].kwargs["headers"]["If-None-Match"] == 'W/"abc"'
+    assert resp.status_code == 200
+    assert resp.json() == {}
+
+
+def test_hf_info_fetches_once_per_repo_and_drops_errors():
+    info = MagicMock()
+    with patch.object(session.HF_API, "model_info", return_value=info) as fetch:
+        assert session.hf_info("model", "a/b") is info
+        assert session.hf_info("model", "a/b") is info
+    fetch.assert_called_once_with(repo_id="a/b", files_metadata=True)
+
+    with patch.object(session.HF_API, "dataset_info", side_effect=OSError):
+        with pytest.raises(OSError):
+            session.hf_info("dataset", "c/d")
+    with patch.object(session.HF_API, "dataset_info", return_value=info):
+        assert session.hf_info("dataset", "c/d") is info
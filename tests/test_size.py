@@ -1,6 +1,6 @@
 import types
 from unittest.mock import patch, MagicMock
-from src.scorer.metrics import size
+from src.scorer.metrics import size, session
 
 
 def test_score_for_hardware_under_limit():
@@ -20,9 +20,9 @@ def test_score_for_hardware_over_limit():
 @patch("src.scorer.metrics.size.get_repo_id", return_value="mock/repo")
 def test_get_size_score_model(mock_get_repo_id):
     # Mock HF_API.model_info
-    fake_file = types.SimpleNamespace(size=100_000_000)
+    fake_file = types.SimpleNamespace(rfilename="model.safetensors", size=100_000_000)
     fake_info = types.SimpleNamespace(siblings=[fake_file, fake_file])
-    with patch.object(size.HF_API, "model_info", return_value=fake_info):
+    with patch.object(session.HF_API, "model_info", return_value=fake_info):
         scores, latency = size.get_size_score("fake_url", "model")
 
     assert isinstance(scores, dict)
@@ -35,7 +35,7 @@ def test_get_size_score_model(mock_get_repo_id):
 def test_get_size_score_dataset(mock_get_repo_id):
     fake_file = types.SimpleNamespace(size=50_000_000)
     fake_info = types.SimpleNamespace(siblings=[fake_file])
-    with patch.object(size.HF_API, "dataset_info", return_value=fake_info):
+    with patch.object(session.HF_API, "dataset_info", return_value=fake_info):
         scores, latency = size.get_size_score("fake_url", "dataset")
 
     assert isinstance(scores, dict)
@@ -46,7 +46,7 @@ def test_get_size_score_dataset(mock_get_repo_id):
 def test_get_size_score_code(mock_get_repo_id):
     fake_response = {"size": 1024}  # GitHub "size" is KB
     with patch(
-        "src.scorer.metrics.size.requests.get",
+        "src.scorer.metrics.session.SESSION.get",
         return_value=MagicMock(json=lambda: fake_response),
     ):
         scores, latency = size.get_size_score("fake_url", "code")
@@ -107,3 +107,12 @@ def test_pick_min_viable_family_tie_breaker_framework():
 def test_pick_min_viable_family_non_weight_files():
     files = [("readme.md", 10), ("script.py", 20)]
     assert size._pick_min_viable_family(files) == 30
+
+
+@patch("src.scorer.metrics.size.get_repo_id", return_value="mock/repo")
+def test_get_size_score_fetch_error_is_none(mock_get_repo_id):
+    # a failed fetch is not "0 bytes, fits everywhere"
+    with patch.object(session.HF_API, "model_info", side_effect=OSError("down")):
+        scores, latency = size.get_size_score("fake_url", "model")
+    assert scores is None
+    assert isinstance(latency, int)